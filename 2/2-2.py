@@ -1,7 +1,11 @@
 """kleine Einmaleins. """
 
+import os
+import tempfile
 import numpy as np
 
+import outer_table
+
 # Define the array a of shape (9,1)
 a = np.arange(1,10).reshape(9,1)
 
@@ -14,4 +18,12 @@ produkt = a * b
 print(produkt)
 
 
-
+# The same table computed in tiles and written to a memory-mapped file.
+# The product is symmetric, so only the upper triangle is stored.
+with tempfile.TemporaryDirectory() as verzeichnis:
+    pfad = os.path.join(verzeichnis, 'einmaleins.npy')
+    tabelle = outer_table.table(np.multiply, a, b, pfad, symmetric=True)
+    i, j = np.indices((9, 9))
+    print(np.array_equal(tabelle[outer_table.triangle_index(i, j, 9)],
+                         produkt), tabelle.dtype)
+    del tabelle
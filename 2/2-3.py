@@ -2,30 +2,11 @@
 
 import numpy as np
 
-def sieb(n):
-    """ Returns a boolean array such that the element is true if the 
-    corresponding integer is a prime number. """
-    
-    
-    # The returned array, initialised to all true.
-    markiert = np.ones(n, dtype=bool)
-    
-    
-    # One is not  prime number.
-    markiert[0] = False
-    markiert[1] = False
-    
-    
-    # The ceiled square root of the upper integer to check.
-    rootn = int(np.ceil(np.sqrt(n)))+1
-    
-    
-    for i in range(2, rootn):
-        if markiert[i]==True:
-            markiert[i**2::i] = False
-
-    return markiert
-    
+from sieve import sieb, primes, wheel_sieb, wheel_primes
+import prime_count
+from factorization import spf_sieb, factorize
+from primality import is_prime
+
 n = 20
 indices = sieb(n)
 
@@ -34,3 +15,34 @@ zahlen = np.arange(n)
 print(zahlen[indices])
 
 
+# For large n the primes are generated window by window, so that
+# the memory consumption stays bounded.
+n = 10**8
+anzahl = sum(p.size for p in primes(n))
+print(f'There are {anzahl} primes below {n}.')
+
+
+# The bit-packed sieve only needs one byte for 30 integers.
+bits = wheel_sieb(n)
+print(f'The bit-packed sieve uses {bits.nbytes / 1e6:.1f} MB, '
+      f'the last prime below {n} is {wheel_primes(bits, n)[-1]}.')
+
+
+# Meissel-Lehmer only sieves up to n**(2/3). For small x it is compared
+# with the number of primes the plain sieve finds.
+anzahl = np.cumsum(sieb(10**5 + 1))
+x_klein = list(range(1000)) + list(range(1000, 10**5 + 1, 997))
+abweichend = [x for x in x_klein if prime_count.meissel_lehmer(x) != anzahl[x]]
+print(f'Meissel-Lehmer vs. sieve for {len(x_klein)} x up to 10**5: '
+      f'{len(abweichend)} differences.')
+print(f'Meissel-Lehmer: pi({n}) = {prime_count.pi(n)}, '
+      f'pi(10**12) = {prime_count.pi(10**12)}.')
+
+
+# Factorize many integers at once with the smallest prime factors.
+spf = spf_sieb(10**6)
+print(factorize([360, 9973, 999999], spf))
+
+
+# Miller-Rabin for integers far beyond the sieve.
+print(is_prime([2**61 - 1, 2**64 - 59, 2**64 - 1]))
@@ -11,11 +11,58 @@ import matplotlib as mpl
 import matplotlib.pyplot as plt
 import matplotlib.animation
 
+import fourier
+
 
 # x-Range in which to plot
 x = np.linspace(0, 2 * np.pi,200)
 y = 0 * x
 
+# The recurrence for the harmonics agrees with the direct formula.
+abweichung = np.max(np.abs(fourier.square_wave_partial_sums(x, 1000) -
+                           fourier.square_wave_partial_sums_direct(x, 1000)))
+print(f'Recurrence vs. direct formula, 1000 terms: {abweichung:.1e}')
+
+# The coefficients of the square wave are computed with one FFT from a
+# period of samples, which are zero at the jumps. Any other waveform
+# can be animated by replacing the samples.
+def rechteck(samples):
+    """ Samples of the square wave over one period, zero at the jumps. """
+    werte = np.ones(samples)
+    werte[samples // 2:] = -1
+    werte[[0, samples // 2]] = 0
+    return werte
+
+
+c = fourier.coefficients(rechteck(fourier.SAMPLES))
+abweichung = np.max(np.abs(fourier.synthesize(c, 99, x) -
+                           fourier.square_wave_partial_sums(x, 50)[-1]))
+print(f'FFT vs. analytic coefficients, 50 terms: {abweichung:.1e}')
+
+# Error of the summation kernels at a distance of at least 0.2 from the
+# jumps, and the order needed for an error of 1e-3.
+x_fein = np.linspace(0, 2 * np.pi, 8193)
+fern = np.abs(np.sin(x_fein)) > np.sin(0.2)
+for kernel in fourier.KERNELS:
+    fehler = fourier.summation_errors(c, np.sign(np.sin(x_fein)), x_fein,
+                                      [9, 99, 999], fern, kernel=kernel)
+    ordnung = fourier.order_for_tolerance(c[:4001], np.sign(np.sin(x_fein)),
+                                          x_fein, 1e-3, fern, kernel=kernel)
+    print(f'{kernel:>13}: error {fehler[0]:.1e}, {fehler[1]:.1e}, '
+          f'{fehler[2]:.1e} at order 9, 99, 999, 1e-3 from order {ordnung}')
+
+# Number of terms shown by the animation. The coefficients of the sampled
+# square wave are aliased unless there are many samples per period of the
+# highest harmonic 2 * TERME - 1, so at least 64 are used.
+TERME = 10000
+samples = 64 * 2**int(np.ceil(np.log2(2 * TERME)))
+c_animation = fourier.coefficients(rechteck(samples))
+k = 2 * TERME - 1
+abweichung = abs(2 * abs(c_animation[k]) - 4 / (np.pi * k)) * np.pi * k / 4
+print(f'Relative error of the coefficient of harmonic {k} from {samples} '
+      f'samples: {abweichung:.1e}')
+
+
 # Initialisation of the figure
 #plt.clf()
 fig = plt.figure()
@@ -30,29 +77,44 @@ plot,  = ax.plot(x, y)
 text = ax.text(0, -1, '')
 
 
-# The plotting function1
+# Running partial sum and the number of terms it contains. Every frame
+# adds only the terms which are missing, i.e. exactly one.
+summe = np.zeros_like(x)
+anzahl = 0
+
+
+def init():
+    """ Resets the partial sum when the animation (re)starts. """
+    global anzahl
+    summe[:] = 0
+    anzahl = 0
+    plot.set_ydata(summe)
+    text.set_text('')
+    return plot, text
+
+
+# The plotting function: shows the partial sum with n terms.
 def plot_ft(n):
-    y = 0 * x
-    for i in range(n):
-        # Update the function and the plot
-        y = y + 4 * np.sin((2 * i + 1) * x)/(np.pi * (2 * i + 1))
-        
-        
-        # update plot
-        plot.set_ydata(y)
-        
-        
-        # update text
-        text.set_text(f'n = {n:5.0f}')
-        
-        
+    global anzahl
+    if n < anzahl:
+        init()
+    while anzahl < n:
+        summe[:] += fourier.harmonic(c_animation, 2 * anzahl + 1, x)
+        anzahl += 1
+
+
+    # Update plot and text once per frame.
+    plot.set_ydata(summe)
+    text.set_text(f'n = {n:5.0f}')
     return plot, text
-  
 
-# Initialise the animation
 
-ani = mpl.animation.FuncAnimation(fig, plot_ft, 
-                                          interval=300, blit=True)
+# Initialise the animation, which restarts after TERME terms.
+
+ani = mpl.animation.FuncAnimation(fig, plot_ft, frames=TERME + 1,
+                                          init_func=init,
+                                          interval=300, blit=True,
+                                          cache_frame_data=False)
     
 # Starte die Animation.
 plt.show()
@@ -9,6 +9,8 @@ import numpy as np
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 
+import polygon
+
 
 def plot_field(x, y, cycled=True):
     """ Plots the corners of the field as well as its boundaries.
@@ -57,4 +59,40 @@ y = [1.0, 2.8, 3.3, 3.5, 3.4, 2.7, 2.4, 2.3, 2.1, 1.6, 0.9, 0.5, 0.0, 1.0]
 plot_field(x, y)
 A = surface(x, y)
 
-print(f'The area is {A:5.4f}.')
\ No newline at end of file
+print(f'The area is {A:5.4f}.')
+
+
+# The same polygon with the batch function for many polygons, here a
+# single one consisting of all corners.
+A, C = polygon.areas(x, y, [0, len(x)], centroids=True)
+print(f'The area is {A[0]:5.4f}, the centroid ({C[0, 0]:.2f}, {C[0, 1]:.2f}).')
+
+
+# Estimate of the area from random points in the bounding box, which are
+# tested against the edge index of the polygon.
+index = polygon.edge_index(x, y)
+rng = np.random.default_rng(1)
+px = rng.uniform(min(x), max(x), 10**6)
+py = rng.uniform(min(y), max(y), 10**6)
+innen = polygon.contains(index, px, py)
+A_mc = innen.mean() * (max(x) - min(x)) * (max(y) - min(y))
+print(f'Monte Carlo estimate of the area: {A_mc:5.4f}.')
+
+
+# A spiky star, whose long edges would each be entered in many strips if
+# there were as many strips as edges. The index stays a few entries per
+# edge, and the result agrees with matplotlib.
+ecken = 16000
+winkel = np.linspace(0, 2 * np.pi, ecken, endpoint=False)
+radius = np.where(np.arange(ecken) % 2, 2.0, 1.0)
+sx, sy = radius * np.cos(winkel), radius * np.sin(winkel)
+index = polygon.edge_index(sx, sy)
+px = rng.uniform(-2, 2, 10**4)
+py = rng.uniform(-2, 2, 10**4)
+innen = polygon.contains(index, px, py)
+pfad = mpl.path.Path(np.column_stack([sx, sy]))
+abweichend = np.count_nonzero(innen != pfad.contains_points(
+    np.column_stack([px, py])))
+print(f'Star with {ecken} corners: {index.kanten.size / ecken:.1f} index '
+      f'entries per edge, {abweichend} of {px.size} points differ from '
+      f'matplotlib.')
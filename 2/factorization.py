@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Prime factorization of many integers with a table of smallest prime
+    factors. The sieve records for every integer below n its smallest prime
+    factor, so that all queries are factorized together by repeated table
+    lookup instead of trial division.
+"""
+
+import math
+import numpy as np
+
+from sieve import base_primes
+
+
+def spf_sieb(n):
+    """ Returns an array whose element m is the smallest prime factor of
+    the integer m, or zero if m is 0, 1 or a prime number. The factors of
+    composites do not exceed sqrt(n), which allows a small integer type. """
+
+
+    spf = np.zeros(n, dtype=np.min_scalar_type(math.isqrt(max(n - 1, 0))))
+
+
+    # Going through the primes in ascending order, only integers without
+    # a recorded factor receive p.
+    for p in base_primes(n).tolist():
+        vielfache = spf[p * p::p]
+        vielfache[vielfache == 0] = p
+
+    return spf
+
+
+def factorize(zahlen, spf):
+    """ Returns the prime factors of all integers of the array zahlen as a
+    two-dimensional array. Row i holds the factors of zahlen[i] in ascending
+    order, padded with zeros. All integers must be smaller than the size of
+    the table spf (see spf_sieb). """
+
+
+    rest = np.array(zahlen, dtype=np.int64).ravel()
+    if rest.size and (rest.min() < 0 or rest.max() >= spf.size):
+        raise ValueError(f'The integers must lie in [0, {spf.size}).')
+
+
+    # At most log2(n) factors per integer.
+    faktoren = np.zeros((rest.size, max(1, spf.size.bit_length())),
+                        dtype=np.int64)
+
+
+    # Indices of the integers which are not yet completely factorized.
+    aktiv = np.flatnonzero(rest > 1)
+    spalte = 0
+    while aktiv.size:
+        p = spf[rest[aktiv]].astype(np.int64)
+
+
+        # A zero in the table means that the rest itself is prime.
+        p = np.where(p == 0, rest[aktiv], p)
+        faktoren[aktiv, spalte] = p
+        rest[aktiv] //= p
+
+
+        aktiv = aktiv[rest[aktiv] > 1]
+        spalte += 1
+
+    return faktoren[:, :max(spalte, 1)]
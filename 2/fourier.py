@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Partial sums of the Fourier series of the square wave
+        f(x) = 4/pi * sum(sin((2k+1)x)/(2k+1), k=0, k=inf)
+    for many numbers of terms at once, and of arbitrary periodic functions
+    whose coefficients are computed with one real FFT. The partial sums can
+    be weighted with a summation kernel which damps the Gibbs overshoot at
+    jumps of the function.
+"""
+
+import numpy as np
+
+
+# Number of samples per period taken from a callable.
+SAMPLES = 2**16
+
+
+# Summation kernels for the partial sums, see summation_weights.
+KERNELS = ('plain', 'fejer', 'lanczos', 'raised_cosine')
+
+
+def square_wave_partial_sums(x, n):
+    """ Returns the array S of shape (n + 1, x.size), where S[m] is the
+    partial sum with m terms. The harmonics follow from the recurrence
+        sin((2k+3)x) = 2 cos(2x) sin((2k+1)x) - sin((2k-1)x),
+    with 2 cos(2x) = 2 - 4 sin(x)**2, so that np.sin is evaluated only once
+    per grid point. """
+
+
+    x = np.asarray(x, dtype=float)
+    S = np.zeros((n + 1, x.size))
+    sinus = np.sin(x)
+    c = 2 - 4 * sinus**2
+
+
+    # The harmonics sin((2k-1)x) and sin((2k+1)x), starting with k = 0.
+    vorher = -sinus
+    jetzt = sinus.copy()
+    for k in range(n):
+        np.add(S[k], 4 / (np.pi * (2 * k + 1)) * jetzt, out=S[k + 1])
+        vorher, jetzt = jetzt, c * jetzt - vorher
+
+    return S
+
+
+def square_wave_partial_sums_direct(x, n):
+    """ Same as square_wave_partial_sums, but evaluating np.sin for every
+    term. Used to check the accuracy of the recurrence. """
+
+
+    x = np.asarray(x, dtype=float)
+    k = np.arange(n).reshape(-1, 1)
+    S = np.zeros((n + 1, x.size))
+    np.cumsum(4 * np.sin((2 * k + 1) * x) / (np.pi * (2 * k + 1)), axis=0,
+              out=S[1:])
+
+    return S
+
+
+def coefficients(f, periode=2 * np.pi, samples=SAMPLES):
+    """ Returns the complex Fourier coefficients c_k, k = 0 .. M // 2, of
+    the real periodic function
+        f(x) = sum(c_k exp(2 pi i k x / periode), k = -inf .. inf),
+    where c_-k is the complex conjugate of c_k. f is either a callable or
+    the array of its M values at x_j = j * periode / M. """
+
+
+    if callable(f):
+        f = f(np.arange(samples) * periode / samples)
+    f = np.asarray(f, dtype=float)
+
+    return np.fft.rfft(f) / f.size
+
+
+def _grid_size(x, periode):
+    """ Returns the number of points per period if x is an equidistant
+    grid whose spacing divides the period, otherwise None. """
+
+
+    if x.ndim != 1 or x.size < 2:
+        return None
+    dx = x[1] - x[0]
+    if dx <= 0 or not np.allclose(np.diff(x), dx, rtol=1e-9, atol=0):
+        return None
+
+
+    M = periode / dx
+    if abs(M - round(M)) > 1e-6 * M:
+        return None
+    return round(M)
+
+
+def harmonic(c, k, x, periode=2 * np.pi):
+    """ Returns the contribution of the harmonics k and -k to the series
+    at the points x. """
+
+
+    if k == 0:
+        return np.full(np.shape(x), c[0].real)
+    return 2 * np.real(c[k] * np.exp(2j * np.pi * k * np.asarray(x) / periode))
+
+
+def summation_weights(n, kernel='plain'):
+    """ Returns the weights of the harmonics k = 0 .. n in the partial sum
+    of order n:
+        plain           1
+        fejer           1 - k / (n + 1)           (Cesaro means)
+        lanczos         sinc(k / (n + 1))         (sigma factors)
+        raised_cosine   (1 + cos(pi k / (n + 1))) / 2
+    """
+
+
+    t = np.arange(n + 1) / (n + 1)
+    if kernel == 'plain':
+        return np.ones(n + 1)
+    if kernel == 'fejer':
+        return 1 - t
+    if kernel == 'lanczos':
+        return np.sinc(t)
+    if kernel == 'raised_cosine':
+        return (1 + np.cos(np.pi * t)) / 2
+    raise ValueError(f'Unknown kernel {kernel!r}, choose one of {KERNELS}.')
+
+
+def synthesize(c, n, x, periode=2 * np.pi, kernel='plain'):
+    """ Returns the partial sum with the harmonics |k| <= n at the points x,
+    weighted with the summation kernel (see summation_weights). On an
+    equidistant grid whose spacing divides the period, such as
+    np.linspace(0, periode, M + 1), one inverse FFT yields all values.
+    Other points are summed term by term. """
+
+
+    if n >= len(c):
+        raise ValueError(f'Only {len(c) - 1} harmonics are known.')
+    c = c[:n + 1] * summation_weights(n, kernel)
+    x = np.asarray(x, dtype=float)
+    M = _grid_size(x, periode)
+
+
+    if M is None or 2 * n >= M:
+        k = np.arange(1, n + 1).reshape(-1, 1)
+        terme = c[1:n + 1, None] * np.exp(2j * np.pi * k * x.ravel() / periode)
+        werte = c[0].real + 2 * np.real(terme.sum(axis=0))
+        return werte.reshape(x.shape)
+
+
+    # The shift of the grid becomes a phase of the coefficients. The
+    # points beyond one period repeat the first ones.
+    k = np.arange(n + 1)
+    X = np.zeros(M // 2 + 1, dtype=complex)
+    X[:n + 1] = M * c[:n + 1] * np.exp(2j * np.pi * k * x[0] / periode)
+    werte = np.fft.irfft(X, M)
+
+    return werte[np.rint((x - x[0]) * M / periode).astype(int) % M]
+
+
+def summation_errors(c, f, x, ordnungen, maske=None, periode=2 * np.pi,
+                     kernel='plain'):
+    """ Returns the largest deviation of the weighted partial sums of the
+    given orders from the values f of the function at the points x. To
+    measure the error away from jumps, the boolean array maske selects the
+    points to compare, x itself should stay an equidistant grid. """
+
+
+    if maske is None:
+        maske = np.ones(np.shape(x), dtype=bool)
+    return np.array([np.max(np.abs(synthesize(c, n, x, periode, kernel) - f)
+                            [maske]) for n in ordnungen])
+
+
+def order_for_tolerance(c, f, x, toleranz, maske=None, periode=2 * np.pi,
+                        kernel='plain'):
+    """ Returns the smallest order whose weighted partial sum deviates by
+    at most toleranz from the values f at the points x (see
+    summation_errors), or None if the known harmonics do not suffice. The
+    order is found by bisection, the error being taken as decreasing with
+    the order. """
+
+
+    def ok(n):
+        fehler = summation_errors(c, f, x, [n], maske, periode, kernel)
+        return fehler[0] <= toleranz
+
+
+    lo, hi = 0, len(c) - 1
+    if not ok(hi):
+        return None
+    while lo < hi:
+        mitte = (lo + hi) // 2
+        if ok(mitte):
+            hi = mitte
+        else:
+            lo = mitte + 1
+    return lo
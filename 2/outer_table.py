@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Tables of a binary ufunc over all pairs of two vectors, e.g. the
+    multiplication table ufunc = np.multiply, which do not fit into memory.
+    The table is computed in strips of rows and written directly into a
+    memory-mapped .npy file, using the smallest integer type which holds all
+    values. For symmetric operations with a == b only the upper triangle
+    i <= j is stored, packed row by row.
+"""
+
+import numpy as np
+
+
+# Number of table entries computed at once.
+TILE_SIZE = 2**22
+
+
+# Candidates for the type of integer tables, the smallest first.
+UNSIGNED = (np.uint8, np.uint16, np.uint32, np.uint64)
+SIGNED = (np.int8, np.int16, np.int32, np.int64)
+
+
+def _bounds(ufunc, a, b, symmetric, tile_size):
+    """ Returns the smallest and largest value of the table, or bounds of
+    them. For the common ufuncs they follow from the extremes of a and b,
+    otherwise the table is computed once without storing it. """
+
+
+    a_min, a_max = int(a.min()), int(a.max())
+    b_min, b_max = int(b.min()), int(b.max())
+    if ufunc is np.multiply:
+        werte = [a_min * b_min, a_min * b_max, a_max * b_min, a_max * b_max]
+        return min(werte), max(werte)
+    if ufunc is np.add:
+        return a_min + b_min, a_max + b_max
+    if ufunc is np.subtract:
+        return a_min - b_max, a_max - b_min
+    if ufunc is np.mod:
+        # The remainder has the sign of b and is smaller than |b|.
+        return min(0, b_min + 1), max(0, b_max - 1)
+    if ufunc is np.gcd:
+        return 0, max(abs(a_min), abs(a_max), abs(b_min), abs(b_max))
+
+
+    lo, hi = None, None
+    for i0, i1, werte in _strips(ufunc, a, b, symmetric, tile_size):
+        if werte.size:
+            lo = int(werte.min()) if lo is None else min(lo, int(werte.min()))
+            hi = int(werte.max()) if hi is None else max(hi, int(werte.max()))
+    return (0, 0) if lo is None else (lo, hi)
+
+
+def _strips(ufunc, a, b, symmetric, tile_size):
+    """ Generator yielding the rows i0 to i1 of the table, flattened. For
+    symmetric tables only the entries with j >= i are kept. """
+
+
+    zeilen = max(1, tile_size // max(b.size, 1))
+    for i0 in range(0, a.size, zeilen):
+        i1 = min(i0 + zeilen, a.size)
+        if symmetric:
+            werte = ufunc.outer(a[i0:i1], b[i0:])
+            i = np.arange(i1 - i0).reshape(-1, 1)
+            werte = werte[np.arange(b.size - i0) >= i]
+        else:
+            werte = ufunc.outer(a[i0:i1], b)
+        yield i0, i1, werte.ravel()
+
+
+def triangle_index(i, j, n):
+    """ Returns the position of the entry (i, j) of a symmetric n x n table
+    in the packed upper triangle. """
+
+
+    i, j = np.minimum(i, j), np.maximum(i, j)
+    return i * n - i * (i - 1) // 2 + (j - i)
+
+
+def table(ufunc, a, b, path, symmetric=False, tile_size=TILE_SIZE):
+    """ Writes the table ufunc(a[i], b[j]) to the .npy file path and returns
+    it memory-mapped for reading. The table has the shape (a.size, b.size),
+    or, if symmetric, the shape (n * (n + 1) // 2,) of the packed upper
+    triangle (see triangle_index). """
+
+
+    a = np.asarray(a).ravel()
+    b = np.asarray(b).ravel()
+    if symmetric and not np.array_equal(a, b):
+        raise ValueError('A symmetric table needs a == b.')
+
+
+    # Integer tables get the smallest integer type holding all values.
+    # The strips are computed in 64 bits, since the values of the table may
+    # not fit into the type of a and b.
+    dtype = ufunc(a[:0], b[:0]).dtype
+    if np.issubdtype(dtype, np.integer):
+        gross = max(int(a.max()), int(b.max())) > np.iinfo(np.int64).max
+        breit = np.uint64 if gross else np.int64
+        a = a.astype(breit, copy=False)
+        b = b.astype(breit, copy=False)
+        lo, hi = _bounds(ufunc, a, b, symmetric, tile_size)
+        typen = UNSIGNED if lo >= 0 else SIGNED
+        passend = [t for t in typen
+                   if np.iinfo(t).min <= lo and hi <= np.iinfo(t).max]
+        if not passend:
+            raise OverflowError('The values do not fit into 64-bit integers.')
+        dtype = passend[0]
+
+
+    n = a.size
+    shape = (n * (n + 1) // 2,) if symmetric else (a.size, b.size)
+    tabelle = np.lib.format.open_memmap(path, 'w+', dtype=dtype, shape=shape)
+    flach = tabelle.reshape(-1)
+    for i0, i1, werte in _strips(ufunc, a, b, symmetric, tile_size):
+        start = int(triangle_index(i0, i0, n)) if symmetric else i0 * b.size
+        flach[start:start + werte.size] = werte
+    tabelle.flush()
+    del flach, tabelle
+
+    return np.load(path, mmap_mode='r')
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Areas of many polygons at once with the gaussian trapezoidal formula.
+    The corners of all polygons are stored one after the other in the flat
+    arrays x and y. Polygon i consists of the corners offsets[i] to
+    offsets[i+1] - 1, i.e. offsets has one element more than there are
+    polygons and ends with x.size. The corners may be cycled or not.
+    The area of a single polygon with too many corners to hold in memory
+    is computed from a binary file, which is read piece by piece.
+    For testing many points against one polygon, its edges are sorted into
+    horizontal strips once, so that each point is only compared with the
+    few edges of its strip.
+"""
+
+import collections
+import numpy as np
+
+
+# Number of corners read at once from a file, and number of pairs of point
+# and edge compared at once by contains.
+CHUNK = 2**20
+
+
+# Bound on the mean number of strips an edge is entered in by edge_index.
+STRIP_ENTRIES = 4
+
+
+# Edges of a polygon sorted into horizontal strips of equal height. The
+# edges of strip s are kanten[offsets[s]:offsets[s+1]].
+EdgeIndex = collections.namedtuple(
+    'EdgeIndex', ['xa', 'ya', 'xb', 'yb', 'y0', 'hoehe', 'offsets', 'kanten',
+                  'x_min', 'x_max'])
+
+
+def _next_corner(offsets):
+    """ Returns for each corner the index of the following corner of the
+    same polygon, the last corner being followed by the first. """
+
+
+    naechste = np.arange(1, offsets[-1] + 1)
+    leer = offsets[:-1] == offsets[1:]
+    naechste[offsets[1:][~leer] - 1] = offsets[:-1][~leer]
+
+    return naechste
+
+
+def _sum_per_polygon(werte, offsets):
+    """ Returns the sums of werte over the corners of each polygon. """
+
+
+    summe = np.zeros(offsets.size - 1)
+    leer = offsets[:-1] == offsets[1:]
+    if werte.size:
+        summe[~leer] = np.add.reduceat(werte, offsets[:-1][~leer])
+
+    return summe
+
+
+def areas(x, y, offsets, centroids=False, moments=False):
+    """
+    Returns the areas of all polygons. If centroids is true, the array of
+    the centroids (shape (n, 2)) is returned as well, if moments is true
+    the second moments of area Ixx, Iyy and Ixy with respect to the
+    centroid (shape (n, 3)).
+    Everything is computed in one pass over the corners. Each polygon is
+    shifted to its first corner beforehand, so that large coordinates do
+    not cancel.
+    """
+
+
+    offsets = np.asarray(offsets)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+
+    # Local coordinates with respect to the first corner of each polygon.
+    anzahl = np.diff(offsets)
+    erste = offsets[:-1][anzahl > 0]
+    x0 = np.zeros(anzahl.size)
+    y0 = np.zeros(anzahl.size)
+    x0[anzahl > 0] = x[erste]
+    y0[anzahl > 0] = y[erste]
+    x = x - np.repeat(x0, anzahl)
+    y = y - np.repeat(y0, anzahl)
+
+
+    naechste = _next_corner(offsets)
+    x1, y1 = x[naechste], y[naechste]
+    kreuz = x * y1 - x1 * y
+
+
+    # Twice the signed area, positive for counterclockwise polygons.
+    A = _sum_per_polygon(kreuz, offsets) / 2
+    ergebnis = [np.abs(A)]
+    if not (centroids or moments):
+        return ergebnis[0]
+
+
+    # Zero areas give nan.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cx = _sum_per_polygon((x + x1) * kreuz, offsets) / (6 * A)
+        cy = _sum_per_polygon((y + y1) * kreuz, offsets) / (6 * A)
+    if centroids:
+        ergebnis.append(np.column_stack([x0 + cx, y0 + cy]))
+
+
+    if moments:
+        Ixx = _sum_per_polygon((y**2 + y * y1 + y1**2) * kreuz, offsets) / 12
+        Iyy = _sum_per_polygon((x**2 + x * x1 + x1**2) * kreuz, offsets) / 12
+        Ixy = _sum_per_polygon((x * y1 + 2 * x * y + 2 * x1 * y1 + x1 * y)
+                               * kreuz, offsets) / 24
+
+
+        # Steiner's theorem, and the sign for clockwise polygons.
+        vorzeichen = np.sign(A)
+        ergebnis.append(np.column_stack([
+            vorzeichen * (Ixx - A * cy**2),
+            vorzeichen * (Iyy - A * cx**2),
+            vorzeichen * (Ixy - A * cx * cy)]))
+
+    return tuple(ergebnis)
+
+
+def stream_area(pfad, dtype=np.float64, chunk=CHUNK):
+    """
+    Returns the area of the polygon whose corners are stored in the file
+    pfad, either a .npy file of shape (n, 2) or a raw binary file of the
+    given dtype with the coordinates x0, y0, x1, y1, ... The file is
+    memory-mapped and read chunk corners at a time.
+    The coordinates are shifted to the first corner, which makes the
+    closing edge from the last to the first corner vanish. Consecutive
+    chunks overlap by one corner, so that the edge between them is
+    counted, and their contributions are added with Neumaier's
+    compensated summation.
+    """
+
+
+    if str(pfad).endswith('.npy'):
+        ecken = np.load(pfad, mmap_mode='r')
+    else:
+        ecken = np.memmap(pfad, dtype=dtype, mode='r').reshape(-1, 2)
+    n = ecken.shape[0]
+    if n < 3:
+        return 0.0
+    x0, y0 = np.asarray(ecken[0], dtype=float)
+
+
+    summe, korrektur = 0.0, 0.0
+    for start in range(0, n - 1, chunk):
+        block = np.asarray(ecken[start:start + chunk + 1], dtype=float)
+        x = block[:, 0] - x0
+        y = block[:, 1] - y0
+        wert = float(np.sum(x[:-1] * y[1:] - x[1:] * y[:-1]))
+
+
+        # Neumaier: keep the low-order bits lost in summe + wert.
+        neu = summe + wert
+        if abs(summe) >= abs(wert):
+            korrektur += (summe - neu) + wert
+        else:
+            korrektur += (wert - neu) + summe
+        summe = neu
+
+    return abs(summe + korrektur) / 2
+
+
+def edge_index(x, y, streifen=None):
+    """ Returns the EdgeIndex of the polygon with the corners x, y, cycled
+    or not. By default there are as many strips as edges. The number of
+    strips is reduced if the edges would be entered in more than
+    STRIP_ENTRIES strips on average, e.g. for spiky polygons whose edges
+    are long compared to the height divided by the number of edges. """
+
+
+    xa = np.asarray(x, dtype=float)
+    ya = np.asarray(y, dtype=float)
+    xb, yb = np.roll(xa, -1), np.roll(ya, -1)
+    if streifen is None:
+        streifen = max(1, xa.size)
+
+
+    # An edge of height dy lies in at most dy / hoehe + 2 strips.
+    gesamt = np.sum(np.abs(yb - ya))
+    if gesamt > 0:
+        grenze = STRIP_ENTRIES * xa.size * np.ptp(ya) / gesamt
+        streifen = max(1, min(streifen, int(grenze)))
+
+
+    y0 = ya.min()
+    hoehe = max(ya.max() - y0, np.finfo(float).tiny) / streifen
+
+
+    # Each edge is entered in all strips it overlaps.
+    unten = np.clip(((np.minimum(ya, yb) - y0) // hoehe).astype(np.int64),
+                    0, streifen - 1)
+    oben = np.clip(((np.maximum(ya, yb) - y0) // hoehe).astype(np.int64),
+                   0, streifen - 1)
+    anzahl = oben - unten + 1
+    kanten = np.repeat(np.arange(xa.size), anzahl)
+    s = np.repeat(unten - np.cumsum(anzahl) + anzahl, anzahl) \
+        + np.arange(kanten.size)
+
+
+    ordnung = np.argsort(s, kind='stable')
+    offsets = np.zeros(streifen + 1, dtype=np.int64)
+    np.cumsum(np.bincount(s, minlength=streifen), out=offsets[1:])
+
+    return EdgeIndex(xa, ya, xb, yb, y0, hoehe, offsets, kanten[ordnung],
+                     xa.min(), xa.max())
+
+
+def contains(index, px, py, chunk=CHUNK):
+    """ Returns a boolean array such that the element is true if the point
+    (px, py) lies inside the polygon of the EdgeIndex index. A point is
+    inside if a ray from it in the direction of +x crosses an odd number
+    of edges. Points on the boundary may come out either way. """
+
+
+    px = np.asarray(px, dtype=float)
+    py = np.asarray(py, dtype=float)
+    form = np.broadcast(px, py).shape
+    px = np.broadcast_to(px, form).ravel()
+    py = np.broadcast_to(py, form).ravel()
+    innen = np.zeros(px.size, dtype=bool)
+
+
+    # Only points within the bounding box need to be tested.
+    streifen = index.offsets.size - 1
+    s = np.floor((py - index.y0) / index.hoehe)
+    punkte = np.flatnonzero((s >= 0) & (py <= index.y0 + streifen * index.hoehe)
+                            & (px >= index.x_min) & (px <= index.x_max))
+    s = np.minimum(s[punkte], streifen - 1).astype(np.int64)
+    anzahl = index.offsets[s + 1] - index.offsets[s]
+
+
+    # The pairs of point and edge are formed for groups of points whose
+    # number of pairs stays below chunk.
+    kumuliert = np.cumsum(anzahl)
+    start = 0
+    while start < punkte.size:
+        ende = int(np.searchsorted(kumuliert, kumuliert[start] - anzahl[start]
+                                   + chunk, side='right'))
+        ende = max(ende, start + 1)
+        a = anzahl[start:ende]
+        p = np.repeat(np.arange(start, ende), a)
+        k = index.kanten[np.repeat(index.offsets[s[start:ende]] - np.cumsum(a)
+                                   + a, a) + np.arange(p.size)]
+
+
+        xa, ya = index.xa[k], index.ya[k]
+        xb, yb = index.xb[k], index.yb[k]
+        x, y = px[punkte[p]], py[punkte[p]]
+        schneidet = (ya > y) != (yb > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            schneidet &= x < xa + (y - ya) * (xb - xa) / (yb - ya)
+
+
+        innen[punkte[start:ende]] = np.bincount(
+            p - start, schneidet, minlength=ende - start) % 2 == 1
+        start = ende
+
+    return innen.reshape(form)
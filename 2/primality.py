@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Deterministic Miller-Rabin test for whole arrays of 64-bit integers.
+    Integers below SIEB_LIMIT are looked up in a bit-packed sieve. Up to
+    2**32 the products of two residues fit into uint64, above that the
+    residues are multiplied in Montgomery form, with the 128-bit products
+    assembled from 32-bit halves, so that nothing overflows.
+"""
+
+import functools
+import numpy as np
+
+from sieve import wheel_sieb, wheel_lookup
+
+
+# Integers below this limit are looked up in the sieve.
+SIEB_LIMIT = 2**24
+
+
+# Witnesses which make the test deterministic below 2**32 and below 2**64.
+WITNESSES_32 = (2, 7, 61)
+WITNESSES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+
+
+# Integers above SIEB_LIMIT divisible by one of these primes are composite
+# without testing.
+KLEINE_PRIMZAHLEN = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47)
+
+
+# Number of integers tested at once.
+BLOCK = 2**15
+
+
+M32 = np.uint64(0xFFFFFFFF)
+S32 = np.uint64(32)
+
+
+@functools.lru_cache(maxsize=1)
+def sieve_bits():
+    """ Returns the bit-packed sieve below SIEB_LIMIT. """
+
+
+    return wheel_sieb(SIEB_LIMIT)
+
+
+def mul128(a, b):
+    """ Returns the high and low 64 bits of the products a * b. """
+
+
+    a0, a1 = a & M32, a >> S32
+    b0, b1 = b & M32, b >> S32
+    p00, p01, p10, p11 = a0 * b0, a0 * b1, a1 * b0, a1 * b1
+
+
+    mitte = (p00 >> S32) + (p01 & M32) + (p10 & M32)
+    lo = (mitte << S32) | (p00 & M32)
+    hi = p11 + (p01 >> S32) + (p10 >> S32) + (mitte >> S32)
+
+    return hi, lo
+
+
+def redc(hi, lo, m, m_strich):
+    """ Montgomery reduction (hi * 2**64 + lo) / 2**64 mod m for odd m,
+    where m * m_strich = -1 mod 2**64 and hi < m. """
+
+
+    u = lo * m_strich
+    uh, ul = mul128(u, m)
+
+
+    # lo + ul is a multiple of 2**64, it carries unless lo is zero.
+    s1 = hi + uh
+    s2 = s1 + (lo != 0).astype(np.uint64)
+    ueberlauf = (s1 < hi) | (s2 < s1)
+
+    return np.where(ueberlauf | (s2 >= m), s2 - m, s2)
+
+
+def _test_32(n, d, s, a):
+    """ Returns true for the odd n < 2**32 which are strong probable primes
+    to the base a. The products of two residues fit into uint64. """
+
+
+    a = np.uint64(a) % n
+    x = np.ones(n.size, dtype=np.uint64)
+    basis, e = a, d.copy()
+    while e.any():
+        x = np.where(e & np.uint64(1), x * basis % n, x)
+        basis = basis * basis % n
+        e >>= np.uint64(1)
+
+
+    minus_eins = n - np.uint64(1)
+    ok = (a == 0) | (x == 1) | (x == minus_eins)
+    for r in range(1, int(s.max(initial=0))):
+        x = x * x % n
+        ok |= (x == minus_eins) & (r < s)
+
+    return ok
+
+
+def _test_64(n, d, s, a):
+    """ Returns true for the odd n which are strong probable primes to the
+    base a, using Montgomery multiplication. """
+
+
+    # -1/n mod 2**64 by Newton's iteration, starting from n, which is its
+    # own inverse modulo 8.
+    inv = n.copy()
+    for _ in range(5):
+        inv *= np.uint64(2) - n * inv
+    m_strich = np.uint64(0) - inv
+
+
+    def mul(x, y):
+        return redc(*mul128(x, y), n, m_strich)
+
+
+    # The base and one in Montgomery form, i.e. multiplied by 2**64 mod n.
+    # The former is obtained by doubling a mod n 64 times.
+    eins = (np.uint64(0) - n) % n
+    basis = np.uint64(a) % n + np.zeros(n.size, dtype=np.uint64)
+    null = basis == 0
+    for _ in range(64):
+        doppelt = basis << np.uint64(1)
+        basis = np.where((basis >> np.uint64(63) == 1) | (doppelt >= n),
+                         doppelt - n, doppelt)
+
+
+    x, e = eins.copy(), d.copy()
+    while e.any():
+        x = np.where(e & np.uint64(1), mul(x, basis), x)
+        basis = mul(basis, basis)
+        e >>= np.uint64(1)
+
+
+    minus_eins = n - eins
+    ok = null | (x == eins) | (x == minus_eins)
+    for r in range(1, int(s.max(initial=0))):
+        x = mul(x, x)
+        ok |= (x == minus_eins) & (r < s)
+
+    return ok
+
+
+def _miller_rabin(n, witnesses, test):
+    """ Returns true for the odd n passing the test for all witnesses.
+    Each witness is only applied to the integers which passed so far. """
+
+
+    d, s = _zerlege(n)
+    prim = np.ones(n.size, dtype=bool)
+    index = np.arange(n.size)
+    for a in witnesses:
+        ok = test(n[index], d[index], s[index], a)
+        prim[index[~ok]] = False
+        index = index[ok]
+
+    return prim
+
+
+def _zerlege(n):
+    """ Returns d and s with n - 1 = d * 2**s and d odd. """
+
+
+    d = n - np.uint64(1)
+    s = np.zeros(n.size, dtype=np.int64)
+    gerade = (d & np.uint64(1)) == 0
+    while gerade.any():
+        d = np.where(gerade, d >> np.uint64(1), d)
+        s += gerade
+        gerade = (d & np.uint64(1)) == 0
+
+    return d, s
+
+
+def is_prime(zahlen):
+    """ Returns a boolean array such that the element is true if the
+    corresponding element of zahlen is a prime number. """
+
+
+    zahlen = np.asarray(zahlen, dtype=np.uint64)
+    n = zahlen.ravel()
+    prim = np.zeros(n.size, dtype=bool)
+
+
+    klein = n < SIEB_LIMIT
+    prim[klein] = wheel_lookup(sieve_bits(), n[klein].astype(np.int64))
+
+
+    # Integers above the limit with a small prime factor are composite.
+    kandidat = ~klein
+    for p in KLEINE_PRIMZAHLEN:
+        kandidat &= n % np.uint64(p) != 0
+
+
+    # The remaining integers are tested in blocks which fit into the cache.
+    for maske, test, witnesses in [
+            (n < 2**32, _test_32, WITNESSES_32),
+            (n >= 2**32, _test_64, WITNESSES_64)]:
+        index = np.flatnonzero(kandidat & maske)
+        for i in range(0, index.size, BLOCK):
+            block = index[i:i + BLOCK]
+            prim[block] = _miller_rabin(n[block], witnesses, test)
+
+    return prim.reshape(zahlen.shape)
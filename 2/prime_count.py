@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Prime counting function pi(x) after Meissel and Lehmer.
+        pi(x) = phi(x, a) + a - 1 - P2(x, a),    a = pi(x^(1/3))
+    phi(y, k) counts the integers 1 <= m <= y which are not divisible by any
+    of the first k primes and P2 the integers up to x with exactly two prime
+    factors larger than p_a. Both only need pi(y) for y < x^(2/3), which is
+    read from a bit-packed sieve of that size instead of sieving up to x.
+    pi sieves small x directly; meissel_lehmer always uses the method.
+"""
+
+import functools
+import math
+import numpy as np
+
+from sieve import WHEEL, WHEEL_RESIDUES, sieb, wheel_sieb
+from prime_table import POPCOUNT
+
+
+# phi(y, k) for k <= SMALL is read from a table of period 2*3*5*7*11*13.
+SMALL = 6
+
+
+# Below this limit pi(x) is counted with the plain sieve.
+SIEB_LIMIT = 10**6
+
+
+# Number of residues coprime to 30 up to r, and the bit masks selecting them.
+ANZAHL_RESIDUES = np.searchsorted(WHEEL_RESIDUES, np.arange(WHEEL),
+                                  side='right')
+MASKE = ((1 << np.arange(WHEEL_RESIDUES.size + 1)) - 1).astype(np.uint8)
+
+
+def icbrt(x):
+    """ Returns the largest integer c with c**3 <= x. """
+
+
+    c = int(round(x ** (1 / 3)))
+    while c**3 > x:
+        c -= 1
+    while (c + 1)**3 <= x:
+        c += 1
+    return c
+
+
+@functools.lru_cache(maxsize=None)
+def phi_table(k):
+    """ Returns the period Q of phi(y, k) and the array of phi(r, k) for
+    0 <= r <= Q, so that phi(y, k) = (y // Q) * phi(Q, k) + phi(y % Q, k).
+    """
+
+
+    zahlen = np.nonzero(sieb(20))[0][:k]
+    Q = int(np.prod(zahlen))
+    markiert = np.ones(Q + 1, dtype=bool)
+    markiert[0] = False
+    for p in zahlen:
+        markiert[::p] = False
+
+    return Q, np.cumsum(markiert)
+
+
+@functools.lru_cache(maxsize=4)
+def pi_table(limit):
+    """ Returns the bit-packed sieve below limit and the number of primes
+    stored in front of each of its bytes. """
+
+
+    bits = wheel_sieb(limit)
+    anzahl = np.zeros(bits.size, dtype=np.int64)
+    np.cumsum(POPCOUNT[bits[:-1]], out=anzahl[1:])
+
+    return bits, anzahl
+
+
+def pi_lookup(y, table):
+    """ Returns pi(y) for an array y of integers below the limit of the
+    table (see pi_table). """
+
+
+    bits, anzahl = table
+    k, r = np.divmod(y, WHEEL)
+    klein = (y >= 2).astype(np.int64) + (y >= 3) + (y >= 5)
+
+    return anzahl[k] + POPCOUNT[bits[k] & MASKE[ANZAHL_RESIDUES[r]]] + klein
+
+
+def phi(x, a, zahlen, table):
+    """ Returns phi(x, a) given the first primes zahlen and the pi table.
+    The recursion
+        phi(y, k) = phi(y, c) - sum(phi(y // p_j, j - 1), j = c + 1 .. k)
+    is carried out level by level on arrays of nodes. A node is resolved as
+    phi(y, k) = pi(y) - k + 1 as soon as y < p_(k+1)**2, equal nodes of a
+    level are merged before they are expanded again. """
+
+
+    c = min(SMALL, a)
+    Q, klein = phi_table(c)
+    quadrate = zahlen * zahlen
+
+
+    # The nodes sign * phi(y, k) which still have to be expanded.
+    y = np.array([x], dtype=np.int64)
+    k = np.array([a], dtype=np.int64)
+    vorzeichen = np.array([1], dtype=np.int64)
+    summe = 0
+    while y.size:
+        q, r = np.divmod(y, Q)
+        summe += int(vorzeichen @ (q * klein[-1] + klein[r]))
+
+
+        # Children with p_j**2 > y are phi(z, j - 1) = 1 for 1 <= z < p_j
+        # and zero for p_j > y. They are only counted.
+        bis_quadrat = np.minimum(np.searchsorted(quadrate, y, side='right'), k)
+        bis_y = np.minimum(np.searchsorted(zahlen, y, side='right'), k)
+        einsen = bis_y - np.maximum(bis_quadrat, c)
+        summe -= int(vorzeichen @ np.maximum(einsen, 0))
+
+
+        # The remaining children j = c + 1 .. bis_quadrat of each node.
+        m = np.maximum(bis_quadrat - c, 0)
+        eltern = np.repeat(np.arange(y.size), m)
+        j = c + np.arange(eltern.size) - np.repeat(np.cumsum(m) - m, m)
+        z = y[eltern] // zahlen[j]
+        vorzeichen = -vorzeichen[eltern]
+
+
+        # phi(z, j) with z < p_(j+1)**2 follows from pi(z).
+        fertig = (z < quadrate[j]) | (j == c)
+        werte = np.where(j[fertig] == c,
+                         (z[fertig] // Q) * klein[-1] + klein[z[fertig] % Q],
+                         pi_lookup(np.where(j[fertig] == c, 0, z[fertig]),
+                                   table) - j[fertig] + 1)
+        summe += int(vorzeichen[fertig] @ werte)
+
+
+        # Merge equal nodes of the next level. Nodes whose signs cancel
+        # are dropped.
+        schluessel, index = np.unique(z[~fertig] * (a + 1) + j[~fertig],
+                                      return_inverse=True)
+        vorzeichen = np.bincount(index, vorzeichen[~fertig]).astype(np.int64)
+        y, k = np.divmod(schluessel[vorzeichen != 0], a + 1)
+        vorzeichen = vorzeichen[vorzeichen != 0]
+
+    return summe
+
+
+def meissel_lehmer(x):
+    """ Returns the number of primes less than or equal to x by the method
+    of Meissel and Lehmer, for any x. """
+
+
+    x = int(x)
+    if x < 2:
+        return 0
+
+
+    # All values of pi needed lie below (icbrt(x) + 1)**2 > x**(2/3).
+    c3 = icbrt(x)
+    table = pi_table((c3 + 1)**2)
+    zahlen = np.nonzero(sieb(math.isqrt(x) + 2))[0]
+    a = int(np.searchsorted(zahlen, c3, side='right'))
+    b = int(np.searchsorted(zahlen, math.isqrt(x), side='right'))
+
+
+    # P2 = sum(pi(x // p_i) - (i - 1), i = a + 1 .. b)
+    i = np.arange(a + 1, b + 1)
+    P2 = int(np.sum(pi_lookup(x // zahlen[a:b], table) - (i - 1)))
+
+    return phi(x, a, zahlen, table) + a - 1 - P2
+
+
+def pi(x):
+    """ Returns the number of primes less than or equal to x. Below
+    SIEB_LIMIT the primes are simply sieved. """
+
+
+    x = int(x)
+    if x < 2:
+        return 0
+    if x < SIEB_LIMIT:
+        return int(np.count_nonzero(sieb(x + 1)))
+
+    return meissel_lehmer(x)
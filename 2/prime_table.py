@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Persistent table of the prime numbers.
+    The table is sieved once and stored in a directory as the bit-packed
+    sieve of sieve.wheel_sieb together with the cumulative number of primes
+    in front of each block of BLOCK bytes. Loading maps the bits through
+    np.memmap, so that a query only reads the block it needs: pi(x), the
+    k-th prime and the next prime are answered by a binary search in the
+    block counts plus a scan of a single block.
+"""
+
+import os
+import numpy as np
+
+from sieve import WHEEL, WHEEL_RESIDUES, base_primes, sieb_segment
+
+
+# Bytes of the bit-packed sieve per block, i.e. 30 * 4096 integers.
+BLOCK = 2**12
+
+
+# Blocks sieved at once while building the table.
+BLOCKS_PER_SEGMENT = 8
+
+
+# Number of set bits of each byte.
+POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None],
+                         axis=1).sum(axis=1)
+
+
+# The primes which are not stored in the bit-packed sieve.
+KLEIN = (2, 3, 5)
+
+
+def build(path, n):
+    """ Sieves the integers below n and stores the table in the directory
+    path. n is rounded up to a whole number of blocks. """
+
+
+    blocks = max(1, -(-n // (WHEEL * BLOCK)))
+    limit = WHEEL * BLOCK * blocks
+    basis = base_primes(limit)
+
+
+    os.makedirs(path, exist_ok=True)
+    bits = np.lib.format.open_memmap(os.path.join(path, 'bits.npy'), 'w+',
+                                     dtype=np.uint8, shape=(BLOCK * blocks,))
+    counts = np.zeros(blocks + 1, dtype=np.int64)
+
+
+    segment = WHEEL * BLOCK * BLOCKS_PER_SEGMENT
+    for low in range(0, limit, segment):
+        high = min(low + segment, limit)
+
+
+        # Keep the columns of the integers coprime to 30 and pack them.
+        markiert = sieb_segment(low, high, basis).reshape(-1, WHEEL)
+        packed = np.packbits(markiert[:, WHEEL_RESIDUES], axis=1,
+                             bitorder='little').ravel()
+
+
+        k = low // WHEEL
+        bits[k:k + packed.size] = packed
+        counts[k // BLOCK + 1:(k + packed.size) // BLOCK + 1] = \
+            POPCOUNT[packed].reshape(-1, BLOCK).sum(axis=1)
+
+    bits.flush()
+    np.save(os.path.join(path, 'counts.npy'), np.cumsum(counts))
+
+
+def load(path):
+    """ Returns the table stored in the directory path as the tuple
+    (bits, counts). The bits are memory-mapped, not read. """
+
+
+    bits = np.load(os.path.join(path, 'bits.npy'), mmap_mode='r')
+    counts = np.load(os.path.join(path, 'counts.npy'))
+
+    return bits, counts
+
+
+def limit(table):
+    """ Returns the upper limit (exclusive) of the integers in the table. """
+
+
+    bits, counts = table
+    return WHEEL * bits.size
+
+
+def pi(table, x):
+    """ Returns the number of primes less than or equal to x. """
+
+
+    bits, counts = table
+    x = int(x)
+    if x >= limit(table):
+        raise ValueError(f'{x} is beyond the table limit {limit(table)}.')
+    if x < 7:
+        return sum(p <= x for p in KLEIN)
+
+
+    # Whole bytes in front of x, then the residues up to x in its byte.
+    k = x // WHEEL
+    block = k // BLOCK
+    anzahl = int(counts[block]) + int(POPCOUNT[bits[block * BLOCK:k]].sum())
+    r = int(np.searchsorted(WHEEL_RESIDUES, x % WHEEL, side='right'))
+    anzahl += int(POPCOUNT[bits[k] & ((1 << r) - 1)])
+
+    return anzahl + len(KLEIN)
+
+
+def nth_prime(table, k):
+    """ Returns the k-th prime number, nth_prime(table, 1) = 2. """
+
+
+    bits, counts = table
+    k = int(k)
+    if k < 1:
+        raise ValueError('k must be positive.')
+    if k <= len(KLEIN):
+        return KLEIN[k - 1]
+
+
+    j = k - len(KLEIN)
+    if j > counts[-1]:
+        raise ValueError(f'The table holds only {counts[-1] + len(KLEIN)} '
+                         'primes.')
+
+
+    # The block containing the j-th stored prime.
+    block = int(np.searchsorted(counts, j)) - 1
+    i = np.flatnonzero(np.unpackbits(bits[block * BLOCK:(block + 1) * BLOCK],
+                                     bitorder='little'))
+    i = int(i[j - int(counts[block]) - 1])
+
+    return WHEEL * (block * BLOCK + (i >> 3)) + int(WHEEL_RESIDUES[i & 7])
+
+
+def next_prime(table, y):
+    """ Returns the smallest prime number greater than y. """
+
+
+    return nth_prime(table, pi(table, y) + 1)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Sieb des Eratosthenes for large upper limits.
+    The plain sieve keeps one byte per integer in memory. For large n the
+    interval [0, n) is therefore split into windows which fit into the cache
+    and which are sieved one after the other with the base primes up to
+    sqrt(n).
+    Alternatively, only the integers coprime to 30 = 2*3*5 are stored, one
+    bit each. One byte then covers 30 consecutive integers.
+    The windows are independent of each other and can be distributed over
+    a pool of processes.
+"""
+
+import math
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+
+
+# Number of integers sieved at once. One byte per integer, i.e. 1 MB.
+SEGMENT_SIZE = 2**20
+
+
+# Modulus of the wheel and the residues coprime to it. Byte k of the
+# bit-packed sieve holds the integers 30*k + WHEEL_RESIDUES, bit j
+# corresponding to WHEEL_RESIDUES[j].
+WHEEL = 30
+WHEEL_RESIDUES = np.array([1, 7, 11, 13, 17, 19, 23, 29])
+
+
+# Bit position of each residue modulo 30, -1 if it is not coprime to 30.
+WHEEL_BIT = np.full(WHEEL, -1)
+WHEEL_BIT[WHEEL_RESIDUES] = np.arange(WHEEL_RESIDUES.size)
+
+
+def sieb(n):
+    """ Returns a boolean array such that the element is true if the
+    corresponding integer is a prime number. """
+
+
+    # The returned array, initialised to all true.
+    markiert = np.ones(n, dtype=bool)
+
+
+    # Zero and one are not prime numbers.
+    markiert[:2] = False
+
+
+    # The ceiled square root of the upper integer to check.
+    rootn = min(int(np.ceil(np.sqrt(n)))+1, n)
+
+
+    for i in range(2, rootn):
+        if markiert[i]==True:
+            markiert[i**2::i] = False
+
+    return markiert
+
+
+def base_primes(n):
+    """ Returns the primes p with p*p < n, i.e. all primes needed to
+    sieve the interval [0, n). """
+
+
+    rootn = math.isqrt(max(n - 1, 0)) + 1
+    return np.nonzero(sieb(rootn))[0]
+
+
+def sieb_segment(low, high, basis):
+    """ Returns a boolean array of length high - low such that the element
+    is true if the integer low + index is a prime number.
+    basis must contain all primes p with p*p < high (see base_primes).
+    """
+
+
+    markiert = np.ones(high - low, dtype=bool)
+
+
+    # Zero and one are not prime numbers.
+    markiert[:max(0, 2 - low)] = False
+
+
+    # Only primes whose square lies inside the window strike out anything.
+    basis = basis[:np.searchsorted(basis * basis, high)]
+
+
+    # First multiple of each prime inside the window, but not below p**2,
+    # so that the prime itself is never struck out.
+    start = np.maximum(basis * basis, -(-low // basis) * basis) - low
+
+
+    for p, s in zip(basis.tolist(), start.tolist()):
+        markiert[s::p] = False
+
+    return markiert
+
+
+def primes(n, segment_size=SEGMENT_SIZE):
+    """ Generator yielding the prime numbers below n as arrays, one array
+    per window of segment_size integers. Only one window and the base
+    primes up to sqrt(n) are kept in memory, so the memory consumption
+    does not grow with n. For n <= segment_size this is sieb(n). """
+
+
+    if n <= segment_size:
+        yield np.nonzero(sieb(n))[0]
+        return
+
+
+    basis = base_primes(n)
+
+
+    for low in range(0, n, segment_size):
+        high = min(low + segment_size, n)
+        yield low + np.nonzero(sieb_segment(low, high, basis))[0]
+
+
+def _segments(n, segment_size):
+    """ Returns the windows [low, high) covering [0, n). """
+
+
+    return [(low, min(low + segment_size, n))
+            for low in range(0, n, segment_size)]
+
+
+# State of a worker process of the pool, set by _init_worker.
+_worker = {}
+
+
+def _init_worker(basis, name=None, n=0):
+    """ Stores the base primes and attaches the shared result buffer. """
+
+
+    _worker['basis'] = basis
+    if name is not None:
+        _worker['shm'] = shared_memory.SharedMemory(name=name)
+        _worker['markiert'] = np.ndarray(n, dtype=bool,
+                                         buffer=_worker['shm'].buf)
+
+
+def _fill_segment(segment):
+    """ Sieves a window directly into the shared result buffer. """
+
+
+    low, high = segment
+    _worker['markiert'][low:high] = sieb_segment(low, high, _worker['basis'])
+
+
+def _primes_segment(segment):
+    """ Sieves a window and returns the primes in it. """
+
+
+    low, high = segment
+    return low + np.nonzero(sieb_segment(low, high, _worker['basis']))[0]
+
+
+def parallel_sieb(n, processes=None, segment_size=SEGMENT_SIZE):
+    """ Returns the same boolean array as sieb(n). The windows are sieved
+    by a pool of processes which write into a shared memory buffer. """
+
+
+    basis = base_primes(n)
+    shm = shared_memory.SharedMemory(create=True, size=max(n, 1))
+    try:
+        with multiprocessing.Pool(processes, _init_worker,
+                                  (basis, shm.name, n)) as pool:
+            pool.map(_fill_segment, _segments(n, segment_size))
+        markiert = np.ndarray(n, dtype=bool, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return markiert
+
+
+def parallel_primes(n, processes=None, segment_size=SEGMENT_SIZE):
+    """ Generator yielding the same arrays of primes as primes(n) for
+    n > segment_size. The windows are sieved by a pool of processes and
+    the primes are returned in ascending order. """
+
+
+    basis = base_primes(n)
+    with multiprocessing.Pool(processes, _init_worker, (basis,)) as pool:
+        yield from pool.imap(_primes_segment, _segments(n, segment_size))
+
+
+def wheel_sieb(n):
+    """ Returns the bit-packed sieve of the integers below n (see WHEEL).
+    A bit is set if the corresponding integer is a prime number. The
+    primes 2, 3 and 5 are not stored. """
+
+
+    nbytes = -(-n // WHEEL)
+    bits = np.full(nbytes, 0xFF, dtype=np.uint8)
+    if nbytes == 0:
+        return bits
+
+
+    # One is not a prime number.
+    bits[0] &= np.uint8(0xFE)
+
+
+    # The composites p*q with q coprime to 30 and q >= p. Within each of
+    # the eight residue classes of q the multiples lie in the same bit
+    # of every p-th byte, so that they can be struck out with a slice.
+    for p in base_primes(WHEEL * nbytes)[3:].tolist():
+        for r in WHEEL_RESIDUES.tolist():
+            m = p * (p + (r - p) % WHEEL)
+            maske = np.uint8(0xFF ^ (1 << int(WHEEL_BIT[m % WHEEL])))
+            bits[m // WHEEL::p] &= maske
+
+    return bits
+
+
+def wheel_primes(bits, n):
+    """ Returns the prime numbers below n from the bit-packed sieve. """
+
+
+    i = np.flatnonzero(np.unpackbits(bits, bitorder='little'))
+    zahlen = WHEEL * (i >> 3) + WHEEL_RESIDUES[i & 7]
+
+
+    klein = np.array([2, 3, 5])
+    return np.concatenate([klein[klein < n], zahlen[zahlen < n]])
+
+
+def wheel_lookup(bits, x):
+    """ Returns a boolean array such that the element is true if the
+    corresponding element of x is a prime number. The elements of x must
+    lie in [0, WHEEL * bits.size), which covers the limit the bit-packed
+    sieve was built for. """
+
+
+    x = np.asarray(x, dtype=np.int64)
+    if x.size and (x.min() < 0 or x.max() >= WHEEL * bits.size):
+        raise ValueError(f'The integers must lie in [0, {WHEEL * bits.size}).')
+    form = x.shape
+    x = x.ravel()
+    bit = WHEEL_BIT[x % WHEEL]
+    markiert = (x == 2) | (x == 3) | (x == 5)
+
+
+    # Only integers coprime to 30 are stored in the sieve.
+    koprim = bit >= 0
+    markiert[koprim] = (bits[x[koprim] // WHEEL] >> bit[koprim]) & 1 == 1
+
+    return markiert.reshape(form)[()]
+
+
+def wheel_to_sieb(bits, n):
+    """ Converts the bit-packed sieve into the boolean array returned
+    by sieb(n). """
+
+
+    markiert = np.zeros(n, dtype=bool)
+    markiert[wheel_primes(bits, n)] = True
+
+    return markiert
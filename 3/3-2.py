@@ -9,6 +9,7 @@
 import math
 import numpy as np
 import scipy.integrate
+import normal
 
 def f(x, mean, sigma):
     """ Normal distribution. Standard deviation: sigma, Mean: 0
@@ -26,7 +27,7 @@ x_max = 2.05
 # With numpy
 mean_np = np.mean(T)
 sigma_np = np.std(T, ddof=1)
-delta_T_np = sigma / math.sqrt(T.size)
+delta_T_np = sigma_np / math.sqrt(T.size)
 
 
 # Integrate using QUADPACK. Returns the integral .
@@ -36,6 +37,11 @@ p, err = scipy.integrate.quad(f, x_min, x_max, args=(mean_np, sigma_np))
 print(f'{p*100:.1f}% of the measurements are expected between {x_min:.2f} and {x_max:.2f}.')
 
 
+# The same probability from the distribution function, without integration.
+p = normal.interval_probability(x_min, x_max, mean_np, sigma_np)
+print(f'From the error function: {p*100:.1f}%')
+
+
 
 
 
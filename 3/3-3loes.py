@@ -3,8 +3,10 @@ Schwingungdauer eines Pendels innerhalb eines bestimmten
 Intervalls T_min bis T_max liegen. """
 
 import math
+import time
 import numpy as np
 import scipy.integrate
+import normal
 
 # Gemessene Schwingungsdauern [s].
 T = np.array([2.05, 1.99, 2.06, 1.97, 2.01,
@@ -30,4 +32,70 @@ p, err = scipy.integrate.quad(f, T_min, T_max)
 
 # Gib das Ergebnis aus.
 print(f'Im Intervall von {T_min:.2f} s bis {T_max:.2f} s liegen '
-      f'{100*p:.1f}% der Messwerte.')
\ No newline at end of file
+      f'{100*p:.1f}% der Messwerte.')
+
+# Dasselbe ohne Integration aus der Verteilungsfunktion.
+p = normal.interval_probability(T_min, T_max, mittel, sigma)
+print(f'Aus der Fehlerfunktion: {100*p:.1f}%')
+
+
+# Vergleich der Rechenzeit für viele Kombinationen aus Mittelwert,
+# Standardabweichung und Intervall.
+rng = np.random.default_rng(1)
+anzahl = 10**6
+m = rng.normal(mittel, 0.01, anzahl)
+s = sigma * rng.uniform(0.5, 2, anzahl)
+a = T_min + rng.normal(0, 0.01, anzahl)
+b = T_max + rng.normal(0, 0.01, anzahl)
+
+
+start = time.perf_counter()
+p = normal.interval_probability(a, b, m, s)
+dauer = time.perf_counter() - start
+
+
+# Mit quad nur für einen Teil der Kombinationen.
+k = 2000
+start = time.perf_counter()
+p_quad = np.array([scipy.integrate.quad(
+    lambda x: math.exp(-(x - m[i])**2 / (2 * s[i]**2))
+    / (math.sqrt(2 * math.pi) * s[i]), a[i], b[i])[0] for i in range(k)])
+dauer_quad = (time.perf_counter() - start) * anzahl / k
+
+
+print(f'{anzahl} Wahrscheinlichkeiten: {dauer:.3f} s mit erf, '
+      f'geschätzt {dauer_quad:.0f} s mit quad, '
+      f'maximale Abweichung {np.abs(p[:k] - p_quad).max():.1e}.')
+
+
+# Wahrscheinlichkeit für mehrere korrelierte Messgrößen: Schwingungsdauer
+# [s], Länge [m], Winkel [rad] und zwei weitere Größen. Alle sollen
+# gleichzeitig in ihrem Intervall liegen.
+mittel_5 = np.array([2.006, 1.00, 0.10, 0.50, 3.0])
+sigma_5 = np.array([0.035, 0.005, 0.01, 0.02, 0.1])
+korrelation = np.array([[1.0, 0.6, 0.3, 0.1, 0.0],
+                        [0.6, 1.0, 0.2, 0.0, 0.1],
+                        [0.3, 0.2, 1.0, 0.4, 0.2],
+                        [0.1, 0.0, 0.4, 1.0, 0.5],
+                        [0.0, 0.1, 0.2, 0.5, 1.0]])
+kovarianz = korrelation * np.outer(sigma_5, sigma_5)
+untere = np.array([T_min, 0.995, 0.09, 0.47, -np.inf])
+obere = np.array([T_max, 1.010, 0.12, 0.55, 3.1])
+
+
+start = time.perf_counter()
+p, fehler = normal.box_probability(untere, obere, mittel_5, kovarianz,
+                                   samples=2**12, replicas=8, seed=1)
+dauer = time.perf_counter() - start
+print(f'Alle fünf Größen im Intervall: p = {p:.6f} ± {fehler:.1e} '
+      f'mit {8 * 2**12} Sobol-Punkten in {dauer:.3f} s.')
+
+
+# Gewöhnliches Monte-Carlo mit derselben Zahl an Punkten, und die Zahl der
+# Punkte, die es für denselben Fehler bräuchte.
+x = rng.multivariate_normal(mittel_5, kovarianz, 8 * 2**12)
+innen = np.all((x >= untere) & (x <= obere), axis=1)
+fehler_mc = innen.std() / math.sqrt(innen.size)
+print(f'Monte-Carlo: p = {innen.mean():.4f} ± {fehler_mc:.1e}, für '
+      f'denselben Fehler wären {innen.size * (fehler_mc / fehler)**2:.1e} '
+      f'Punkte nötig.')
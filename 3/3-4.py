@@ -8,12 +8,11 @@
 
 
 import numpy as np
-import scipy.optimize
 import matplotlib.pyplot as plt
 
-# Define the exponential function to be fitted
-def abs_pol(v, b, n):
-    return b * np.abs(v)**n 
+import models
+from models import abs_pol
+from propagation import propagate, propagate_linear
 
 
 # Velocity and velocity error [m/s]
@@ -24,9 +23,8 @@ dv = np.array([0.3, 0.3, 0.2, 0.2, 0.1])
 F = np.array([0.10, 0.15, 0.22, 0.33, 0.36])
 dF = np.array([0.02, 0.02, 0.02, 0.02, 0.02])
 
-# Optimising the parameters
-popt, pcov = scipy.optimize.curve_fit(abs_pol, v, F, 
-                            sigma=dF)
+# Optimising the parameters with the analytic Jacobian of abs_pol
+popt, pcov = models.fit('abs_pol', v, F, sigma=dF)
 # Unpacking the parameters
 b, n = popt
 
@@ -38,6 +36,16 @@ print('Result of the optimisation')
 print(f'b = ({b:4.5f} +- {d_b:2.5f}) [N*s^n/m^n].')
 print(f'n = {n:4.2f} +- {d_n:2.2f}.')
 
+# Propagate the correlated uncertainties of b and n to the force at 15 m/s
+def F_15(b, n):
+    return abs_pol(15.0, b, n)
+
+F_mc, d_F_mc, (F_lo, F_median, F_hi) = propagate(F_15, popt, pcov, seed=0)
+F_lin, d_F_lin = propagate_linear(F_15, popt, pcov)
+print(f'F(15 m/s) = ({F_mc:4.3f} +- {d_F_mc:2.3f}) N, '
+      f'95% in [{F_lo:4.3f}, {F_hi:4.3f}] N (Monte Carlo).')
+print(f'F(15 m/s) = ({F_lin:4.3f} +- {d_F_lin:2.3f}) N (linearized).')
+
 # initialise a figure and an axis object
 fig = plt.figure()
 ax = fig.add_subplot(1, 1, 1)
@@ -10,9 +10,8 @@ import numpy as np
 import scipy.optimize
 import matplotlib.pyplot as plt
 
-# Define the amplitude function to be fitted
-def amplitude(f, A_0, f_0, deltaf):
-    return A_0 * f_0**2 / np.sqrt( ( f**2 - f_0**2 )**2 + ( deltaf * f / np.pi )**2 )
+import models
+from models import amplitude
 
 
 # frequency [Hz]
@@ -25,9 +24,9 @@ A = np.array([0.84, 1.42, 1.80, 2.10, 2.22,
 dA = np.array([0.04, 0.07, 0.09, 0.11, 0.11,
                0.10, 0.08, 0.03, 0.02])
 
-# Optimising the parameters
-popt, pcov = scipy.optimize.curve_fit(amplitude, f, A, 
-                            [0.8, 0.7, 0.3], sigma=dA)
+# Optimising the parameters with the analytic Jacobian of amplitude
+popt, pcov, info, _, _ = models.fit('amplitude', f, A, [0.8, 0.7, 0.3],
+                                    sigma=dA, full_output=True)
 # Unpacking the parameters
 A_0, f_0, deltaf = popt
 
@@ -40,6 +39,13 @@ print(f'A_0 = ({A_0:4.2f} +- {d_A_0:2.2f}) cm.')
 print(f'f_0 = ({f_0:4.3f} +- {d_f_0:2.3f}) Hz.')
 print(f'deltaf = ({deltaf:4.2f} +- {d_deltaf:2.2f}) 1/s.')
 
+# Without the Jacobian, curve_fit needs further evaluations of the model
+# for the finite differences.
+info_fd = scipy.optimize.curve_fit(amplitude, f, A, [0.8, 0.7, 0.3],
+                                   sigma=dA, full_output=True)[2]
+print(f'{info["nfev"]} evaluations of the model and {info["njev"]} of the '
+      f'Jacobian, {info_fd["nfev"]} with finite differences.')
+
 # initialise a figure and an axis object
 fig = plt.figure()
 ax = fig.add_subplot(1, 1, 1)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Fits of one model of models.MODELS to many data sets, e.g. the
+    frequency sweeps of a resonance measurement. The data sets are split
+    into chunks of neighbouring sets, which are fitted by a pool of
+    processes. Within a chunk each fit starts from the result of the
+    previous data set, which is usually close, and only the first from the
+    given guess. A fit which raises an exception or whose covariance
+    matrix is not finite is repeated from the guess. If it fails again the
+    message is kept and the data set is marked as failed, the batch goes
+    on.
+"""
+
+import multiprocessing
+import warnings
+import numpy as np
+import scipy.optimize
+
+import models
+
+
+# Number of data sets fitted one after another by a worker.
+CHUNK = 64
+
+
+# State of a worker process of the pool, set by _init_worker.
+_worker = {}
+
+
+def _init_worker(name, p0, kwargs):
+    """ Stores the model, the initial guess and the options of curve_fit. """
+
+
+    _worker['modell'] = models.MODELS[name]
+    _worker['p0'] = np.asarray(p0, dtype=float)
+    _worker['kwargs'] = kwargs
+
+
+def _fit(x, y, sigma, p0):
+    """ Returns popt and pcov of one data set. """
+
+
+    modell = _worker['modell']
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', scipy.optimize.OptimizeWarning)
+        return scipy.optimize.curve_fit(modell.func, x, y, p0, sigma=sigma,
+                                        jac=modell.jac, **_worker['kwargs'])
+
+
+def _fit_chunk(aufgabe):
+    """ Fits the data sets of a chunk with warm starts. Returns the indices
+    of the sets, their popt and pcov and the error messages. """
+
+
+    indizes, daten = aufgabe
+    p0 = _worker['p0']
+    k = p0.size
+    popt = np.full((len(daten), k), np.nan)
+    pcov = np.full((len(daten), k, k), np.nan)
+    meldungen = {}
+
+
+    start = p0
+    for i, (x, y, sigma) in enumerate(daten):
+        index = int(indizes[i])
+        for versuch in ((start, p0) if start is not p0 else (p0,)):
+            try:
+                popt[i], pcov[i] = _fit(x, y, sigma, versuch)
+            except Exception as fehler:
+                meldungen[index] = f'{type(fehler).__name__}: {fehler}'
+                continue
+            if np.all(np.isfinite(pcov[i])):
+                meldungen.pop(index, None)
+                start = popt[i]
+                break
+            meldungen[index] = 'The covariance of the parameters could ' \
+                'not be estimated.'
+
+    return indizes, popt, pcov, meldungen
+
+
+def batch_fit(name, daten, p0, reihenfolge=None, processes=None,
+              chunk=CHUNK, **kwargs):
+    """
+    Fits the model `name` of models.MODELS to each data set (x, y, sigma)
+    of the sequence daten, sigma may be None. Returns the arrays popt of
+    shape (n, k) and pcov of shape (n, k, k), the boolean array of
+    successful fits and a dict of the error messages of the failed ones.
+    The warm starts need similar data sets next to each other. If they are
+    not, reihenfolge gives the order in which they are fitted, e.g.
+    np.argsort of the position of the maximum. Further keyword arguments
+    are passed to curve_fit.
+    """
+
+
+    p0 = np.asarray(p0, dtype=float)
+    n, k = len(daten), p0.size
+    if reihenfolge is None:
+        reihenfolge = np.arange(n)
+    popt = np.full((n, k), np.nan)
+    pcov = np.full((n, k, k), np.nan)
+    meldungen = {}
+
+
+    aufgaben = ((reihenfolge[i:i + chunk],
+                 [daten[j] for j in reihenfolge[i:i + chunk]])
+                for i in range(0, n, chunk))
+    with multiprocessing.Pool(processes, _init_worker,
+                              (name, p0, kwargs)) as pool:
+        for indizes, p, c, m in pool.imap_unordered(_fit_chunk, aufgaben):
+            popt[indizes] = p
+            pcov[indizes] = c
+            meldungen.update(m)
+
+    erfolg = np.ones(n, dtype=bool)
+    erfolg[list(meldungen)] = False
+    return popt, pcov, erfolg, meldungen
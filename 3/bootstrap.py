@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Bootstrap of the mean and the standard deviation of a measurement
+    series. Instead of assuming normally distributed values, the series is
+    resampled with replacement many times and the spread of the statistics
+    over the resamples gives their standard error and confidence interval.
+    All resamples are drawn as one matrix of indices, which is processed in
+    blocks of at most CHUNK elements.
+"""
+
+import numpy as np
+
+
+# Number of drawn indices held in memory at once.
+CHUNK = 2**22
+
+
+def bootstrap(werte, resamples=10**5, seed=None, chunk=CHUNK):
+    """ Returns the arrays of the means and of the standard deviations
+    (with n - 1) of the resamples. seed is passed to
+    np.random.default_rng, so a Generator may be given as well. The series
+    needs at least two values. """
+
+
+    rng = np.random.default_rng(seed)
+    werte = np.asarray(werte, dtype=float).ravel()
+    n = werte.size
+    if n < 2:
+        raise ValueError('The bootstrap needs at least two values.')
+
+
+    # Deviations from the mean, so that the sum of squares does not cancel.
+    mitte = werte.mean()
+    abweichung = werte - mitte
+
+
+    mittel = np.empty(resamples)
+    sigma = np.empty(resamples)
+    zeilen = max(1, chunk // n)
+    for i in range(0, resamples, zeilen):
+        j = min(i + zeilen, resamples)
+        stichprobe = abweichung[rng.integers(0, n, (j - i, n))]
+        s1 = stichprobe.sum(axis=1)
+        s2 = np.einsum('ij,ij->i', stichprobe, stichprobe)
+        mittel[i:j] = s1 / n
+        sigma[i:j] = np.sqrt(np.maximum(s2 - s1**2 / n, 0) / (n - 1))
+
+    return mitte + mittel, sigma
+
+
+def confidence_interval(stichprobe, konfidenz=0.95):
+    """ Returns the lower and upper limit of the percentile interval which
+    contains the fraction konfidenz of the bootstrap values stichprobe. """
+
+
+    alpha = (1 - konfidenz) / 2
+    return tuple(np.quantile(stichprobe, [alpha, 1 - alpha]))
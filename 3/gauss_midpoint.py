@@ -5,6 +5,9 @@
 """
 
 import math
+import numpy as np
+
+import quadrature
 
 sigma = 0.5         # Standard deviation
 x_max = 3           # Integration domain from -x_max to +x_max
@@ -15,13 +18,19 @@ def f(x):
     """ Normal distribution. Standard deviation: sigma, Mean: 0
     """
     a = 1 / (math.sqrt(2 * math.pi) * sigma)
-    return a * math.exp(- x**2/(2 * sigma**2))
+    return a * np.exp(- x**2/(2 * sigma**2))
+
+
+# The midpoints of all intervals are evaluated at once. They are computed
+# from their index, so that no rounding error accumulates.
+n = round(2 * x_max / dx)
+p = quadrature.midpoint(f, -x_max, x_max, n)
 
+print(p)
 
-x = -x_max
-p = 0.
-while x < x_max:
-    p += f(x + dx/2) * dx
-    x += dx
 
-print(p)
\ No newline at end of file
+# Refine until the Richardson estimate of the error is below 1e-10.
+p, err = quadrature.integrate(f, -x_max, x_max, 'midpoint', tol=1e-10)
+print(f'Midpoint rule: {p} +- {err:.1e}')
+p, err = quadrature.romberg(f, -x_max, x_max, tol=1e-12)
+print(f'Romberg:       {p} +- {err:.1e}')
@@ -5,7 +5,9 @@
 """
 
 import math
+import numpy as np
 import scipy.integrate
+import quadrature
 
 sigma = 0.5         # Standard deviation
 x_max = 3           # Integration domain from -x_max to +x_max
@@ -26,4 +28,44 @@ p, err = scipy.integrate.quad(f, -math.inf, math.inf)
 
 print(f'Result of the integration: {p}')
 print(f'Relative Error of the integration: {(p-1)*100}%')
-print(f'Estimate of the integration: {err}')
\ No newline at end of file
+print(f'Estimate of the integration: {err}')
+
+
+# The same integral with the adaptive Gauss-Kronrod method, which
+# evaluates the integrand on all nodes of a refinement step at once.
+def f_vec(x):
+    """ Normal distribution for an array of x values. """
+    return np.exp(- x**2/(2 * sigma**2)) / (math.sqrt(2 * math.pi) * sigma)
+
+
+p, err, aufrufe, knoten = quadrature.gauss_kronrod(f_vec, -math.inf, math.inf)
+print(f'Gauss-Kronrod: {p}, error estimate {err:.2e}, '
+      f'{aufrufe} calls, {knoten} nodes')
+
+
+# Probabilities within +-x_max for many standard deviations, all sharing
+# one subdivision of the interval.
+sigmas = np.linspace(0.1, 2, 1000)
+p, err, aufrufe, knoten = quadrature.gauss_kronrod(
+    lambda x: np.exp(- x[:, None]**2/(2 * sigmas**2))
+    / (np.sqrt(2 * np.pi) * sigmas), -x_max, x_max)
+exakt = np.array([math.erf(x_max / (s * math.sqrt(2))) for s in sigmas])
+print(f'{sigmas.size} standard deviations: maximum deviation from erf '
+      f'{np.abs(p - exakt).max():.2e}, {aufrufe} calls, {knoten} nodes')
+
+
+# Gaussian quadrature of fixed order. The nodes and weights are computed
+# once per order; each further integral is a single dot product.
+p = quadrature.gauss_legendre(f_vec, -x_max, x_max, n=40)
+print(f'Gauss-Legendre with 40 nodes from {-x_max} to {x_max}: {p}, '
+      f'erf gives {math.erf(x_max / (sigma * math.sqrt(2)))}')
+p, err, n = quadrature.converge(quadrature.gauss_legendre, f_vec,
+                                -x_max, x_max)
+print(f'Gauss-Legendre converged with {n} nodes: {p}, change {err:.1e}')
+
+
+# Expectations over the normal distribution with Gauss-Hermite, e.g.
+# E[cos(X)] = exp(-sigma**2 / 2).
+p, err, n = quadrature.converge(quadrature.gauss_hermite, np.cos, 0, sigma)
+print(f'E[cos(X)] with {n} Gauss-Hermite nodes: {p}, '
+      f'exact {math.exp(-sigma**2 / 2)}')
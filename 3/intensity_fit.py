@@ -8,12 +8,10 @@
 
 
 import numpy as np
-import scipy.optimize
 import matplotlib.pyplot as plt
 
-# Define the exponential function to be fitted
-def exp_dec(d, n_u, n_0, alpha):
-    return n_u + n_0 * np.exp(-alpha * d) 
+import models
+from models import exp_dec
 
 
 # Thickness of the filter [mm]
@@ -24,17 +22,17 @@ d = np.array([0.000, 0.029, 0.039, 0.064, 0.136, 0.198,
 # Measured intensities [counts / minute]
 n = np.array([2193, 1691, 1544, 1244, 706, 466, 
               318, 202, 108, 80, 52, 47, 
-              45, 46, 47, 42, 43], dtype=np.float)
+              45, 46, 47, 42, 43], dtype=float)
 
 # Uncertainty on the measured intensities
 dn = np.array([47, 41, 39, 35, 26, 22,
                18, 14, 10, 9, 7, 7, 
-               7, 7, 7, 7, 7], dtype=np.float)
+               7, 7, 7, 7, 7], dtype=float)
 
 # Optimising the parameters
-popt, pcov = scipy.optimize.curve_fit(exp_dec, d, n, 
-                            # Initial guess of the parameters
-                            [40, 2200, 10], sigma=dn)
+popt, pcov = models.fit('exp_dec', d, n,
+                        # Initial guess of the parameters
+                        [40, 2200, 10], sigma=dn)
 # Unpacking the parameters
 n_u, n_0, alpha = popt
 
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Fit models of the exercises together with their analytic Jacobians.
+    scipy.optimize.curve_fit otherwise estimates the derivatives with
+    respect to the parameters by finite differences, which costs one
+    evaluation of the model per parameter and iteration. The Jacobian of a
+    model is called like the model and returns an array of shape
+    (x.size, number of parameters).
+"""
+
+import collections
+import numpy as np
+import scipy.optimize
+
+
+# A model function f(x, *p), its Jacobian jac(x, *p) and the names of the
+# parameters p.
+Model = collections.namedtuple('Model', ['func', 'jac', 'parameter'])
+
+
+def abs_pol(v, b, n):
+    """ Power law F(v) = b |v|**n. """
+    return b * np.abs(v)**n
+
+
+def abs_pol_jac(v, b, n):
+    """ Derivatives of abs_pol with respect to b and n. """
+    betrag = np.abs(np.asarray(v, dtype=float))
+    potenz = betrag**n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log = np.where(betrag > 0, np.log(betrag), 0.0)
+    return np.column_stack([potenz, b * potenz * log])
+
+
+def amplitude(f, A_0, f_0, deltaf):
+    """ Amplitude of a driven damped oscillator at the frequency f. """
+    return A_0 * f_0**2 / np.sqrt((f**2 - f_0**2)**2
+                                  + (deltaf * f / np.pi)**2)
+
+
+def amplitude_jac(f, A_0, f_0, deltaf):
+    """ Derivatives of amplitude with respect to A_0, f_0 and deltaf. """
+    f = np.asarray(f, dtype=float)
+    verstimmung = f**2 - f_0**2
+    D = verstimmung**2 + (deltaf * f / np.pi)**2
+    wurzel = np.sqrt(D)
+    return np.column_stack([
+        f_0**2 / wurzel,
+        A_0 * f_0 / wurzel * (2 + 2 * f_0**2 * verstimmung / D),
+        -A_0 * f_0**2 * deltaf * f**2 / (np.pi**2 * D * wurzel)])
+
+
+def exp_dec(d, n_u, n_0, alpha):
+    """ Exponential decay n(d) = n_u + n_0 exp(-alpha d) over a background. """
+    return n_u + n_0 * np.exp(-alpha * d)
+
+
+def exp_dec_jac(d, n_u, n_0, alpha):
+    """ Derivatives of exp_dec with respect to n_u, n_0 and alpha. """
+    d = np.asarray(d, dtype=float)
+    e = np.exp(-alpha * d)
+    return np.column_stack([np.ones_like(d), e, -n_0 * d * e])
+
+
+MODELS = {'abs_pol': Model(abs_pol, abs_pol_jac, ('b', 'n')),
+          'amplitude': Model(amplitude, amplitude_jac,
+                             ('A_0', 'f_0', 'deltaf')),
+          'exp_dec': Model(exp_dec, exp_dec_jac, ('n_u', 'n_0', 'alpha'))}
+
+
+def fit(name, x, y, p0=None, sigma=None, **kwargs):
+    """ Fits the model `name` of MODELS to the data with curve_fit, passing
+    the analytic Jacobian. Returns what curve_fit returns. """
+
+
+    modell = MODELS[name]
+    if p0 is None:
+        p0 = np.ones(len(modell.parameter))
+    return scipy.optimize.curve_fit(modell.func, x, y, p0, sigma=sigma,
+                                    jac=modell.jac, **kwargs)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Probabilities that a normally distributed measurement lies in an
+    interval,
+        P(a <= x <= b) = Phi((b - mittel) / sigma) - Phi((a - mittel) / sigma),
+    without numerical integration. All arguments are broadcast against each
+    other, so that many means, standard deviations and intervals are handled
+    in one call. The difference of the two values of the distribution
+    function Phi is formed in log space from scipy.special.log_ndtr, and
+    intervals in the upper tail are reflected to the lower tail, where Phi
+    is small and exact. Hence even probabilities far below 1e-300 keep
+    their relative accuracy.
+    The probability of a box a <= x <= b for correlated normally distributed
+    measurements is an integral over the unit cube after Genz's separation
+    of variables, which is evaluated with scrambled Sobol points.
+"""
+
+import numpy as np
+import scipy.special
+import scipy.stats.qmc
+
+
+# Number of Sobol points evaluated at once, a power of two.
+CHUNK = 2**14
+
+
+# Gauss-Legendre nodes and weights on [-1, 1] for narrow intervals.
+_X, _W = np.polynomial.legendre.leggauss(8)
+
+
+def _log1mexp(d):
+    """ Returns log(1 - exp(d)) for d <= 0 without cancellation. """
+
+
+    d = np.asarray(d, dtype=float)
+    with np.errstate(divide='ignore'):
+        return np.where(d > -np.log(2), np.log(-np.expm1(d)),
+                        np.log1p(-np.exp(d)))
+
+
+def _log_ratio(unten, oben):
+    """ Returns log Phi(oben) - log Phi(unten), the integral of phi / Phi
+    from unten to oben, by Gauss-Legendre quadrature. phi / Phi is smooth,
+    so that the result is accurate for narrow intervals, where the
+    difference of the logarithms cancels. """
+
+
+    mitte = (oben + unten) / 2
+    halb = (oben - unten) / 2
+    z = mitte[:, None] + halb[:, None] * _X
+    r = np.exp(-z**2 / 2 - np.log(2 * np.pi) / 2 - scipy.special.log_ndtr(z))
+
+    return halb * (r @ _W)
+
+
+def log_interval_probability(a, b, mittel=0.0, sigma=1.0):
+    """ Returns the logarithm of the probability that a normally distributed
+    value with the given mean and standard deviation lies between a and b.
+    The limits may be infinite; empty intervals (b <= a) give -inf and nan
+    in any argument gives nan. sigma must be positive. """
+
+
+    sigma = np.asarray(sigma, dtype=float)
+    if np.any(sigma <= 0):
+        raise ValueError('The standard deviation must be positive.')
+    za = (np.asarray(a, dtype=float) - mittel) / sigma
+    zb = (np.asarray(b, dtype=float) - mittel) / sigma
+    za, zb = np.broadcast_arrays(za, zb)
+    form = za.shape
+    za, zb = za.ravel(), zb.ravel()
+
+
+    # Intervals above the mean: P = Phi(-za) - Phi(-zb).
+    with np.errstate(invalid='ignore'):
+        gespiegelt = za + zb > 0
+    unten = np.where(gespiegelt, -zb, za)
+    oben = np.where(gespiegelt, -za, zb)
+
+
+    # P = Phi(oben) * (1 - Phi(unten) / Phi(oben)).
+    log_oben = scipy.special.log_ndtr(oben)
+    with np.errstate(invalid='ignore'):
+        d = scipy.special.log_ndtr(unten) - log_oben
+        eng = (oben - unten < 1) & (oben > unten)
+    d[eng] = -_log_ratio(unten[eng], oben[eng])
+    ergebnis = log_oben + _log1mexp(np.minimum(d, 0))
+
+    ergebnis = np.where(oben > unten, ergebnis, -np.inf)
+    ergebnis[np.isnan(za) | np.isnan(zb)] = np.nan
+
+    return ergebnis.reshape(form)[()]
+
+
+def interval_probability(a, b, mittel=0.0, sigma=1.0):
+    """ Returns the probability that a normally distributed value with the
+    given mean and standard deviation lies between a and b. """
+
+
+    return np.exp(log_interval_probability(a, b, mittel, sigma))
+
+
+def _genz(w, a, b, L):
+    """ Returns the integrand of Genz's method at the points w of the unit
+    cube (shape (m, d - 1)) for the box a, b of a centred normal
+    distribution with the Cholesky factor L of its covariance matrix. """
+
+
+    d = a.size
+    y = np.empty((w.shape[0], d - 1))
+    unten = np.full(w.shape[0], scipy.special.ndtr(a[0] / L[0, 0]))
+    oben = np.full(w.shape[0], scipy.special.ndtr(b[0] / L[0, 0]))
+    wert = oben - unten
+    for i in range(1, d):
+        u = unten + w[:, i - 1] * (oben - unten)
+        y[:, i - 1] = scipy.special.ndtri(np.clip(u, 1e-300, 1 - 1e-16))
+        s = y[:, :i] @ L[i, :i]
+        unten = scipy.special.ndtr((a[i] - s) / L[i, i])
+        oben = scipy.special.ndtr((b[i] - s) / L[i, i])
+        wert *= oben - unten
+
+    return wert
+
+
+def box_probability(a, b, mittel, kovarianz, samples=2**12, replicas=8,
+                    seed=None, chunk=CHUNK):
+    """
+    Returns the probability that a normally distributed vector with the
+    given mean and covariance matrix lies in the box a <= x <= b, and the
+    standard error of this estimate. The limits may be infinite.
+    The box probability is transformed into an integral over the unit cube
+    of dimension d - 1 whose integrand is smooth, following Genz. It is
+    averaged over `replicas` independently scrambled Sobol sequences of
+    `samples` points each (rounded up to a power of two), and the spread of
+    the replicas gives the error. seed is passed to
+    np.random.default_rng.
+    """
+
+
+    rng = np.random.default_rng(seed)
+    mittel = np.atleast_1d(np.asarray(mittel, dtype=float))
+    a = np.broadcast_to(np.asarray(a, dtype=float) - mittel, mittel.shape)
+    b = np.broadcast_to(np.asarray(b, dtype=float) - mittel, mittel.shape)
+    L = np.linalg.cholesky(np.atleast_2d(np.asarray(kovarianz, dtype=float)))
+    if np.any(b <= a):
+        return 0.0, 0.0
+    if mittel.size == 1:
+        return float(interval_probability(a[0], b[0], 0.0, L[0, 0])), 0.0
+
+
+    m = 1 << max(0, int(samples - 1).bit_length())
+    schaetzung = np.empty(replicas)
+    for r in range(replicas):
+        sobol = scipy.stats.qmc.Sobol(mittel.size - 1, seed=rng)
+        summe = 0.0
+        for i in range(0, m, chunk):
+            summe += _genz(sobol.random(min(chunk, m - i)), a, b, L).sum()
+        schaetzung[r] = summe / m
+
+    return (float(schaetzung.mean()),
+            float(schaetzung.std(ddof=1) / np.sqrt(replicas)))
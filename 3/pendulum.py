@@ -8,6 +8,9 @@
 import math
 import numpy as np
 
+from running_stats import RunningStats
+from bootstrap import bootstrap, confidence_interval
+
 
 # Measured values of the period [s]
 T = np.array([2.05, 1.99, 2.06, 1.97, 2.01, 
@@ -16,20 +19,12 @@ T = np.array([2.05, 1.99, 2.06, 1.97, 2.01,
 # Number of measures
 n  = T.size
 
-# Calculating the mean
-mean = 0
-for x in T:
-    mean += x
-mean /= n
-
-# Calculating the Standard Deviation
-sigma = 0
-for x in T:
-    sigma += (x - mean) **2
-sigma = math.sqrt(sigma / (n - 1))
-
-# Calculating the Standard error of the mean
-delta_T = sigma / math.sqrt(n)
+# Calculating mean, standard deviation and standard error of the mean
+# with an accumulator, which would also accept the values in chunks.
+stats = RunningStats().update(T)
+mean = stats.mean
+sigma = stats.std
+delta_T = stats.sem
 
 print(f'Mean:                         <T> = {mean:.10f} s')
 print(f"Standard Deviatio :             \u03C3 = {sigma:.10f} s")
@@ -51,22 +46,10 @@ print(f"Standard Deviatio :              {np.abs(sigma_np-sigma)/sigma:.2f} s")
 print(f'Standard Error of the Mean:     {np.abs(delta_T_np-delta_T)/delta_T:.2f} s')
 
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+# Bootstrap confidence intervals, which do not assume normally
+# distributed values.
+mean_bs, sigma_bs = bootstrap(T, seed=1)
+mean_lo, mean_hi = confidence_interval(mean_bs)
+sigma_lo, sigma_hi = confidence_interval(sigma_bs)
+print(f'95% interval of the mean (bootstrap):     [{mean_lo:.4f}, {mean_hi:.4f}] s')
+print(f'95% interval of \u03C3 (bootstrap):            [{sigma_lo:.4f}, {sigma_hi:.4f}] s')
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Propagation of uncertainties to derived quantities, e.g.
+        g = 4 pi**2 L / T**2
+    from measured L and T, or a quantity computed from the parameters of a
+    fit with their covariance matrix pcov. The Monte Carlo method draws
+    correlated normally distributed parameters and pushes them through the
+    vectorized function in chunks. The linearized method only needs the
+    Jacobian of the function at the mean values.
+"""
+
+import numpy as np
+
+
+# Number of parameter sets drawn at once.
+CHUNK = 2**16
+
+
+def _matrix_root(kovarianz):
+    """ Returns a matrix L with L @ L.T = kovarianz. Covariance matrices
+    which are only positive semidefinite are decomposed into eigenvectors. """
+
+
+    try:
+        return np.linalg.cholesky(kovarianz)
+    except np.linalg.LinAlgError:
+        w, v = np.linalg.eigh(kovarianz)
+        return v * np.sqrt(np.clip(w, 0, None))
+
+
+def propagate(f, mittel, kovarianz, samples=10**6, seed=None, chunk=CHUNK,
+              quantile=(0.025, 0.5, 0.975)):
+    """ Returns the mean, the standard deviation and the given quantiles of
+    f(p_1, ..., p_k), the parameters p being normally distributed with the
+    mean values mittel and the covariance matrix kovarianz. f is called
+    with one array of chunk values per parameter. """
+
+
+    rng = np.random.default_rng(seed)
+    mittel = np.asarray(mittel, dtype=float)
+    L = _matrix_root(np.atleast_2d(np.asarray(kovarianz, dtype=float)))
+
+
+    werte = np.empty(samples)
+    for i in range(0, samples, chunk):
+        j = min(i + chunk, samples)
+        p = mittel + rng.standard_normal((j - i, mittel.size)) @ L.T
+        werte[i:j] = f(*p.T)
+
+    return werte.mean(), werte.std(ddof=1), np.quantile(werte, quantile)
+
+
+def jacobian(f, mittel, schritt=1e-6):
+    """ Returns the gradient of f at mittel by central differences. All
+    2k shifted parameter sets are passed to f in a single call. """
+
+
+    mittel = np.atleast_1d(np.asarray(mittel, dtype=float))
+    h = schritt * np.maximum(np.abs(mittel), 1.0)
+    verschiebung = np.diag(h)
+    p = np.concatenate([mittel + verschiebung, mittel - verschiebung])
+    werte = f(*p.T)
+    k = mittel.size
+
+    return (werte[:k] - werte[k:]) / (2 * h)
+
+
+def propagate_linear(f, mittel, kovarianz, gradient=None):
+    """ Returns the value of f at the mean values and its standard deviation
+    from the linearization sigma**2 = J C J^T. The gradient J is computed
+    by central differences if not given. """
+
+
+    mittel = np.atleast_1d(np.asarray(mittel, dtype=float))
+    if gradient is None:
+        gradient = jacobian(f, mittel)
+    gradient = np.atleast_1d(np.asarray(gradient, dtype=float))
+    kovarianz = np.atleast_2d(np.asarray(kovarianz, dtype=float))
+
+    return f(*mittel), np.sqrt(max(gradient @ kovarianz @ gradient, 0))
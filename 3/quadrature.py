@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Numerical integration with fixed-step rules on numpy grids.
+    The integrand f must accept an array of x values. Each rule evaluates
+    f once on all nodes. The error is estimated by Richardson's method from
+    the results for n and 2n steps, and the number of steps is doubled
+    until the estimate is below the tolerance.
+    The adaptive Gauss-Kronrod method bisects only the intervals whose
+    error is too large. All intervals of one refinement step are evaluated
+    with a single call of f, which may return several integrands at once.
+    Gaussian quadrature of fixed order uses nodes and weights which are
+    computed once per order and cached: Gauss-Legendre for finite intervals,
+    Gauss-Hermite for the expectation of f over a normal distribution.
+"""
+
+import functools
+import numpy as np
+
+
+def midpoint(f, a, b, n):
+    """ Midpoint rule with n steps. """
+
+
+    h = (b - a) / n
+    return h * np.sum(f(a + h * (np.arange(n) + 0.5)))
+
+
+def trapezoid(f, a, b, n):
+    """ Trapezoidal rule with n steps. """
+
+
+    y = f(np.linspace(a, b, n + 1))
+    return (b - a) / n * (np.sum(y[1:-1]) + (y[0] + y[-1]) / 2)
+
+
+def simpson(f, a, b, n):
+    """ Simpson's rule with n steps, n even. """
+
+
+    if n % 2:
+        raise ValueError('Simpson\'s rule needs an even number of steps.')
+    y = f(np.linspace(a, b, n + 1))
+    return (b - a) / (3 * n) * (y[0] + y[-1] + 4 * np.sum(y[1:-1:2])
+                                + 2 * np.sum(y[2:-1:2]))
+
+
+# The rules and the order p of their error h**p.
+RULES = {'midpoint': (midpoint, 2),
+         'trapezoid': (trapezoid, 2),
+         'simpson': (simpson, 4)}
+
+
+def integrate(f, a, b, rule='simpson', tol=1e-10, n=16, n_max=2**24):
+    """ Returns the integral of f from a to b and an estimate of the
+    absolute error
+        (I_2n - I_n) / (2**p - 1).
+    The number of steps starts at n and is doubled until the estimate is
+    smaller than tol, but not beyond n_max. """
+
+
+    regel, p = RULES[rule]
+    alt = regel(f, a, b, n)
+    while True:
+        n *= 2
+        neu = regel(f, a, b, n)
+        fehler = abs(neu - alt) / (2**p - 1)
+        if fehler <= tol or 2 * n > n_max:
+            return neu, fehler
+        alt = neu
+
+
+def romberg(f, a, b, tol=1e-10, k_max=20):
+    """ Returns the integral of f from a to b and an estimate of its
+    absolute error with Romberg's method. The trapezoidal rule with 2**k
+    steps reuses the values of f for 2**(k-1) steps, and the results are
+    extrapolated by Richardson's method. """
+
+
+    h = b - a
+    zeile = [h * (f(np.array([a, b])).sum()) / 2]
+    for k in range(1, k_max + 1):
+        h /= 2
+        neu = [zeile[0] / 2 + h * np.sum(f(a + h * np.arange(1, 2**k, 2)))]
+        for j in range(1, k + 1):
+            neu.append(neu[j - 1] + (neu[j - 1] - zeile[j - 1]) / (4**j - 1))
+        fehler = abs(neu[-1] - zeile[-1])
+        if fehler <= tol:
+            return neu[-1], fehler
+        zeile = neu
+    return zeile[-1], fehler
+
+
+# Nodes x >= 0 and weights of the 15-point Kronrod rule on [-1, 1], and the
+# weights of the embedded 7-point Gauss rule at the odd-numbered nodes.
+_XK = np.array([0.991455371120812639206854697526329,
+                0.949107912342758524526189684047851,
+                0.864864423359769072789712788640926,
+                0.741531185599394439863864773280788,
+                0.586087235467691130294144845693013,
+                0.405845151377397166906606412076961,
+                0.207784955007898467600689403773245,
+                0.000000000000000000000000000000000])
+_WK = np.array([0.022935322010529224963732008058970,
+                0.063092092629978553290700663189204,
+                0.104790010322250183839876322541518,
+                0.140653259715525918745189590510238,
+                0.169004726639267902826583426598550,
+                0.190350578064785409913256402421014,
+                0.204432940075298892414161999234649,
+                0.209482141084727828012999174891714])
+_WG = np.array([0.129484966168869693270611432679082,
+                0.279705391489276667901467771423780,
+                0.381830050505118944950369775488975,
+                0.417959183673469387755102040816327])
+
+
+# All 15 nodes and the weights of both rules on [-1, 1].
+KRONROD_X = np.concatenate([-_XK[:-1], _XK[::-1]])
+KRONROD_W = np.concatenate([_WK[:-1], _WK[::-1]])
+GAUSS_W = np.zeros(15)
+GAUSS_W[1:7:2] = _WG[:-1]
+GAUSS_W[7] = _WG[-1]
+GAUSS_W[9:15:2] = _WG[-2::-1]
+
+
+def _substitution(f, a, b):
+    """ Returns an integrand on a finite interval and its limits, which
+    has the same integral as f from a to b. Infinite limits are mapped by
+        x = t / (1 - t**2),  x = a + t / (1 - t)  or  x = b - t / (1 - t).
+    """
+
+
+    if np.isfinite(a) and np.isfinite(b):
+        return f, a, b
+    if not np.isfinite(a) and not np.isfinite(b):
+        def g(t):
+            x = t / (1 - t**2)
+            return _gewichtet(f(x), (1 + t**2) / (1 - t**2)**2)
+        return g, -1.0, 1.0
+    if np.isfinite(a):
+        def g(t):
+            return _gewichtet(f(a + t / (1 - t)), 1 / (1 - t)**2)
+        return g, 0.0, 1.0
+    def g(t):
+        return _gewichtet(f(b - t / (1 - t)), 1 / (1 - t)**2)
+    return g, 0.0, 1.0
+
+
+def _gewichtet(werte, faktor):
+    """ Multiplies the values of one or more integrands with faktor. """
+
+
+    werte = np.asarray(werte)
+    return werte * faktor.reshape((-1,) + (1,) * (werte.ndim - 1))
+
+
+def gauss_kronrod(f, a, b, tol=1e-10, rtol=1e-10, max_steps=50,
+                  limit=2**16):
+    """
+    Returns the integral of f from a to b, an estimate of its absolute
+    error and the number of calls of f and of evaluated nodes. The limits
+    may be infinite or reversed.
+    f is called with an array of m nodes and must return an array of shape
+    (m,) or, for several integrands sharing the subdivision, (m, k).
+    Every interval is integrated with the 15-point Kronrod rule, the
+    difference to the 7-point Gauss rule being its error. Intervals whose
+    error exceeds their share of max(tol, rtol * |integral|), in proportion
+    to their length, are bisected, all of them being evaluated in the next
+    call of f. The refinement ends after max_steps calls or when more than
+    limit intervals would be evaluated at once. If f is not finite on an
+    interval, the integration stops with the error inf.
+    """
+
+
+    if a == b:
+        return 0.0, 0.0, 0, 0
+    if a > b:
+        wert, fehler, aufrufe, knoten = gauss_kronrod(f, b, a, tol, rtol,
+                                                      max_steps, limit)
+        return -wert, fehler, aufrufe, knoten
+
+
+    g, a, b = _substitution(f, a, b)
+    links = np.array([a], dtype=float)
+    rechts = np.array([b], dtype=float)
+    wert, fehler = 0.0, 0.0
+    aufrufe, knoten = 0, 0
+
+
+    for schritt in range(max_steps):
+        mitte = (links + rechts) / 2
+        halb = (rechts - links) / 2
+        x = mitte[:, None] + halb[:, None] * KRONROD_X
+        y = np.asarray(g(x.ravel()))
+        y = y.reshape(x.shape + y.shape[1:])
+        aufrufe += 1
+        knoten += x.size
+
+
+        # Integrals over each interval; the last axis of y, if any, counts
+        # the integrands.
+        kronrod = _gewichtet(np.tensordot(KRONROD_W, y, axes=(0, 1)), halb)
+        gauss = _gewichtet(np.tensordot(GAUSS_W, y, axes=(0, 1)), halb)
+        abweichung = np.abs(kronrod - gauss).reshape(halb.size, -1)
+        if not np.all(np.isfinite(abweichung)):
+            return wert + kronrod.sum(axis=0), np.inf, aufrufe, knoten
+
+
+        # Each integrand has its own tolerance, relative to the current
+        # estimate of its integral.
+        schranke = np.maximum(tol, rtol * np.abs(wert + kronrod.sum(axis=0)))
+        fertig = np.all(abweichung <= schranke.ravel() * (2 * halb[:, None])
+                        / (b - a), axis=1)
+        if schritt == max_steps - 1 or 2 * np.count_nonzero(~fertig) > limit:
+            fertig[:] = True
+        lokal = abweichung.max(axis=1)
+        wert = wert + kronrod[fertig].sum(axis=0)
+        fehler += lokal[fertig].sum()
+
+
+        links = np.concatenate([links[~fertig], mitte[~fertig]])
+        rechts = np.concatenate([mitte[~fertig], rechts[~fertig]])
+        if links.size == 0:
+            break
+
+    return wert, fehler, aufrufe, knoten
+
+
+@functools.lru_cache(maxsize=64)
+def legendre_nodes(n):
+    """ Returns the n nodes and weights of the Gauss-Legendre rule on
+    [-1, 1]. The arrays are cached and therefore read-only. """
+
+
+    x, w = np.polynomial.legendre.leggauss(n)
+    x.flags.writeable = False
+    w.flags.writeable = False
+    return x, w
+
+
+@functools.lru_cache(maxsize=64)
+def hermite_nodes(n):
+    """ Returns the n nodes and weights of the Gauss-Hermite rule for the
+    standard normal distribution, i.e. sum(w * f(x)) approximates E[f(X)]
+    with X ~ N(0, 1). The arrays are cached and therefore read-only. """
+
+
+    x, w = np.polynomial.hermite_e.hermegauss(n)
+    w /= np.sqrt(2 * np.pi)
+    x.flags.writeable = False
+    w.flags.writeable = False
+    return x, w
+
+
+def gauss_legendre(f, a, b, n=16):
+    """ Returns the integral of f from a to b with the n-point Gauss-Legendre
+    rule. f may return shape (n,) or (n, k) for several integrands. """
+
+
+    x, w = legendre_nodes(n)
+    halb = (b - a) / 2
+    return halb * (w @ np.asarray(f((a + b) / 2 + halb * x)))
+
+
+def gauss_hermite(f, mittel=0.0, sigma=1.0, n=16):
+    """ Returns the expectation of f(X) for X ~ N(mittel, sigma**2), i.e.
+    the integral of f times the normal density, with the n-point
+    Gauss-Hermite rule. f may return shape (n,) or (n, k). """
+
+
+    x, w = hermite_nodes(n)
+    return w @ np.asarray(f(mittel + sigma * x))
+
+
+def converge(regel, f, *args, tol=1e-12, n=4, n_max=256):
+    """ Returns the result of the Gaussian rule regel (gauss_legendre or
+    gauss_hermite) called as regel(f, *args, n=n), an estimate of its
+    absolute error and the order used. The order is doubled until two
+    successive results differ by less than tol, but not beyond n_max. """
+
+
+    alt = regel(f, *args, n=n)
+    while True:
+        n *= 2
+        neu = regel(f, *args, n=n)
+        fehler = np.max(np.abs(neu - alt))
+        if fehler <= tol or 2 * n > n_max:
+            return neu, fehler, n
+        alt = neu
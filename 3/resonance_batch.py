@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Fit of the resonance curve of 3-5.py to many frequency sweeps at once.
+    The sweeps are simulated from the fitted parameters with a resonance
+    frequency that drifts from sweep to sweep and with noise of the size of
+    the measurement errors.
+"""
+
+import time
+import numpy as np
+import scipy.optimize
+
+import batch_fit
+from models import amplitude
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    anzahl = 4000
+
+
+    # frequency [Hz] and relative error of the amplitude
+    f = np.linspace(0.2, 1.33, 40)
+    A_0 = 0.78 * (1 + 0.05 * rng.standard_normal(anzahl))
+    f_0 = np.linspace(0.5, 0.9, anzahl)
+    deltaf = 0.79 * (1 + 0.05 * rng.standard_normal(anzahl))
+    daten = []
+    for i in range(anzahl):
+        A = amplitude(f, A_0[i], f_0[i], deltaf[i])
+        dA = 0.05 * A
+        daten.append((f, A + dA * rng.standard_normal(f.size), dA))
+
+
+    # One fit after another, each from the fixed guess.
+    start = time.perf_counter()
+    for x, y, sigma in daten[:400]:
+        try:
+            scipy.optimize.curve_fit(amplitude, x, y, [0.8, 0.7, 0.3],
+                                     sigma=sigma)
+        except RuntimeError:
+            pass
+    dauer = (time.perf_counter() - start) * anzahl / 400
+    print(f'Serial fits from the fixed guess: about {dauer:.1f} s.')
+
+
+    start = time.perf_counter()
+    popt, pcov, erfolg, meldungen = batch_fit.batch_fit(
+        'amplitude', daten, [0.8, 0.7, 0.3])
+    dauer = time.perf_counter() - start
+    print(f'Batch fit of {anzahl} sweeps: {dauer:.1f} s, '
+          f'{np.count_nonzero(~erfolg)} failed.')
+    print(f'Largest deviation of f_0: '
+          f'{np.nanmax(np.abs(popt[:, 1] - f_0)):.4f} Hz, median error '
+          f'{np.nanmedian(np.sqrt(pcov[:, 1, 1])):.4f} Hz.')
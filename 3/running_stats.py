@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    Mean, standard deviation and standard error of the mean of measurement
+    series which are too long to keep in memory. The values are fed in
+    chunks; each chunk is reduced with numpy and combined with the previous
+    result by the parallel formula of Chan et al. Accumulators of different
+    workers are combined the same way. Many series can be accumulated at
+    once by giving each value the number of its series.
+"""
+
+import numpy as np
+
+
+class RunningStats:
+    """ Accumulator for the mean and the sum of squared deviations M2 of
+    one or of `groups` measurement series. """
+
+
+    def __init__(self, groups=None):
+        form = () if groups is None else (groups,)
+        self.n = np.zeros(form, dtype=np.int64)
+        self.mean = np.zeros(form)
+        self.m2 = np.zeros(form)
+
+
+    def _combine(self, n, mean, m2):
+        """ Adds series with the given count, mean and M2. """
+        gesamt = self.n + n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            anteil = np.where(gesamt > 0, n / gesamt, 0.0)
+        delta = mean - self.mean
+        self.m2 = self.m2 + m2 + delta**2 * self.n * anteil
+        self.mean = self.mean + delta * anteil
+        self.n = gesamt
+
+
+    def update(self, werte, gruppen=None):
+        """ Adds the values of a chunk. For several series, gruppen holds
+        the number of the series of each value. """
+        werte = np.asarray(werte, dtype=float).ravel()
+        if self.n.ndim == 0:
+            n = werte.size
+            mean = werte.mean() if n else 0.0
+            self._combine(n, mean, np.sum((werte - mean)**2))
+            return self
+
+
+        gruppen = np.asarray(gruppen).ravel()
+        k = self.n.size
+        n = np.bincount(gruppen, minlength=k)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(n > 0, np.bincount(gruppen, werte, k) / n, 0.0)
+        m2 = np.bincount(gruppen, (werte - mean[gruppen])**2, k)
+        self._combine(n, mean, m2)
+        return self
+
+
+    def merge(self, other):
+        """ Adds the values accumulated by another accumulator. """
+        self._combine(other.n, other.mean, other.m2)
+        return self
+
+
+    @property
+    def std(self):
+        """ Standard deviation of the values (with n - 1). """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.n > 1, np.sqrt(self.m2 / (self.n - 1)),
+                            np.nan)[()]
+
+
+    @property
+    def sem(self):
+        """ Standard error of the mean. """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.std / np.sqrt(self.n)
+
+
+def grouped_stats(werte, gruppen, groups=None):
+    """ Returns the mean, the standard deviation and the standard error of
+    the mean of each series, the values being assigned to the series by
+    the array gruppen. """
+
+
+    gruppen = np.asarray(gruppen)
+    if groups is None:
+        groups = int(gruppen.max()) + 1 if gruppen.size else 0
+    stats = RunningStats(groups).update(werte, gruppen)
+
+    return stats.mean, stats.std, stats.sem